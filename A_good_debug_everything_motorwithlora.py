@@ -19,6 +19,7 @@ from typing import Dict, Any
 from data_bus import DataBus
 from read_camera import ReadCamera
 from yolo_detector import YoloDetector
+from camera_yolo_stage import CameraYoloStage
 from decision_logic import DecisionLogicModule
 from motor_with_lora import MotorWithLora
 from logger import LoggerModule
@@ -28,6 +29,11 @@ from http_server import HttpServerModule
 # Adjust according to your hardware
 CAMERA_INDEX = 0 
 MODEL_PATH = "/home/arthurseray/Desktop/DRID/DRID_Modules/thermal_person_ncnn_model"
+# Run Camera + YOLO in one thread (no image_queue hop). Set False to use the
+# separate ReadCamera / YoloDetector threads instead.
+FUSED_CAMERA_YOLO = True
+# Shared-memory file holding the latest annotated JPEG (None = anonymous mapping)
+JPEG_SHM_PATH = "/dev/shm/drid_latest_jpeg" if os.path.isdir("/dev/shm") else None
 LOG_DIR = "./everything_debug_logs"
 ARCHIVE_DIR = "./everything_debug_archive"
 
@@ -73,14 +79,19 @@ def main():
 
     # 2. Initialize DataBus
     print("[Main] Initializing DataBus with FULL config...")
-    bus = DataBus(config_override=get_debug_config())
+    bus = DataBus(config_override=get_debug_config(), jpeg_shm_path=JPEG_SHM_PATH)
 
     # 3. Instantiate modules 
     # INCLUDES MOTOR THIS TIME
     print("[Main] Instantiating modules (including Motor)...")
-    modules = [
-        ReadCamera(name="Camera", data_bus=bus),
-        YoloDetector(name="YOLO", data_bus=bus),
+    if FUSED_CAMERA_YOLO:
+        capture_modules = [CameraYoloStage(name="CameraYOLO", data_bus=bus)]
+    else:
+        capture_modules = [
+            ReadCamera(name="Camera", data_bus=bus),
+            YoloDetector(name="YOLO", data_bus=bus),
+        ]
+    modules = capture_modules + [
         DecisionLogicModule(name="Logic", data_bus=bus),
         MotorWithLora(name="Motor", data_bus=bus), # <--- Added Motor
         LoggerModule(name="Logger", data_bus=bus),
@@ -133,7 +144,9 @@ def main():
                 print(f"[Main] Warning: {mod.name} did not terminate cleanly.")
             else:
                 print(f"[Main] {mod.name} stopped.")
-                
+
+        # Unmap the shared JPEG buffer and remove its /dev/shm file
+        bus.close()
         print("[Main] Debug session finished.")
 
 if __name__ == "__main__":
@@ -0,0 +1,91 @@
+"""
+camera_yolo_stage.py
+
+Fused capture + detection stage: Camera -> YOLO -> DataBus in a single thread.
+Consumes: USB camera (same "camera_*" configuration keys as ReadCamera)
+Produces: data_bus.detect_queue (DetectionItem)
+          DataBus Registry Snapshot ((annotated frame, DetectionItem) -> "latest_annotated_frame")
+
+YOLO is the only expensive stage of the pipeline (~60ms at 256px on a Pi), so
+running capture and inference serially in one thread loses no parallelism and
+removes the image_queue handoff (wakeup + thread switch per frame).
+Use it in place of the ReadCamera + YoloDetector pair; the two separate modules
+remain available for setups that do want the image_queue (e.g. batched inference).
+"""
+
+from typing import Any, Dict
+
+# Assume BaseModule and DataBus are available in the project structure
+from module_base import BaseModule
+from data_bus import DataBus
+from read_camera import ReadCamera
+from yolo_detector import YoloDetector
+
+# --- DEFAULT CONFIGURATION (Fallbacks only) ---
+DEFAULT_MAX_FAIL = 5
+
+
+class CameraYoloStage(BaseModule):
+    """
+    Single-thread camera capture and YOLO detection.
+
+    ReadCamera and YoloDetector are used as plain components (their threads are
+    never started): their configuration, setup/teardown and per-frame logic are
+    reused as-is, only the scheduling is fused.
+    """
+
+    # Configuration prefix to match keys in DataBus.config
+    CONFIG_PREFIX = "camera_yolo"
+
+    def __init__(
+        self,
+        data_bus: DataBus,
+        name: str = "CameraYolo",
+        daemon: bool = True,
+        **kwargs: Any,
+    ):
+
+        self.config_prefix = self.CONFIG_PREFIX
+        cfg: Dict[str, Any] = data_bus.get_state("config", {})
+
+        def get_cfg(key: str, default: Any) -> Any:
+            """Retrieves a configuration value using the module's prefix."""
+            full_key = f"{self.config_prefix}_{key}"
+            return cfg.get(full_key, default)
+
+        # 1. BaseModule Configuration
+        max_fail = get_cfg("max_consecutive_fail", DEFAULT_MAX_FAIL)
+
+        super().__init__(
+            name=name,
+            data_bus=data_bus,
+            daemon=daemon,
+            max_consecutive_fail=max_fail,
+            **kwargs
+        )
+
+        # 2. Components (read their own "camera_*" / "yolo_*" configuration).
+        # Never started, so they get no health slot: this stage reports for both.
+        self.camera = ReadCamera(data_bus=data_bus, name=f"{name}.camera", register_health=False)
+        self.detector = YoloDetector(data_bus=data_bus, name=f"{name}.yolo", register_health=False)
+
+    def setup(self) -> None:
+        """Open the camera and load the YOLO model."""
+        print(f"[{self.name}] Setup: Fused camera + YOLO stage.")
+        self.camera.setup()
+        self.detector.setup()
+
+    def teardown(self) -> None:
+        """Release the camera."""
+        try:
+            self.detector.teardown()
+        finally:
+            self.camera.teardown()
+
+    def step(self):
+        """
+        1. Capture one frame (ReadCamera paces it with camera_period_s).
+        2. Run detection on it and push results to the DataBus directly.
+        """
+        image_item = self.camera.capture()
+        self.detector.process_items([image_item])
@@ -5,59 +5,92 @@ Thread-safe shared data hub for the detection unit on Raspberry Pi.
 
 Core responsibilities:
     - Own and expose the main shared queues (excluding processed_image_queue, now a state).
+    - Publish the latest annotated frame as a registry state
+      ("latest_annotated_frame" -> (frame, DetectionItem)).
     - Provide generic queue helpers.
     - Provide a single semantic helper (push_detection_with_image) that updates the registry.
     - Maintain ALL shared state (including latest processed image) in a unified, thread-safe registry.
-    - Provide a thread-safe state change notification mechanism (using Condition).
+    - Provide a thread-safe state change notification mechanism (using an Event).
+    - Provide a fixed-capacity RingBuffer used for the detection handoff (detect_queue).
+    - Provide a lock-free SpscRing used for the camera handoff (image_queue).
+    - Provide a drop-oldest BoundedLatestDeque used for error_log.
+    - Keep per-frame detection events in a lock-free deque (detection_log).
+    - Recycle large frame buffers through a FramePool registry resource
+      (acquire/release_frame_buffer).
+    - Export the latest encoded JPEG through a shared-memory SharedJpegBuffer
+      (publish_jpeg/read_jpeg), read by the HTTP server without any lock.
 """
 
 from __future__ import annotations
 
+import collections
+import itertools
+import mmap
+import os
 import queue
+import struct
 import threading
 import time
 from dataclasses import dataclass
-from typing import Any, Callable, Dict, Optional, List, Tuple
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Iterable, Mapping, Optional, List, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:  # numpy-less tooling can still import the bus; arrays are then stored as given
+    np = None  # type: ignore
 
 
 # ---------------------------------------------------------------------------
 # Typed payloads for clarity
 # ---------------------------------------------------------------------------
+# Slotted (no per-instance __dict__) and frozen: items are created per frame and
+# shared read-only across threads, so no consumer needs a defensive copy.
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ImageItem:
     """Raw image produced by read_camera.py and consumed by yolo_detector.py."""
-    frame: Any              # e.g. numpy.ndarray; kept generic
+    frame: Any              # numpy.ndarray, uint8 [H, W, C] (BGR)
     timestamp: float        # seconds since epoch
     meta: Dict[str, Any]    # extra information (frame id, camera id, etc.)
 
 
-@dataclass
-class ProcessedImageItem:
+@dataclass(slots=True, frozen=True)
+class DetectionItem:
     """
-    Processed image produced by yolo_detector.py.
-
-    This item includes both the annotated frame and the detection data.
+    Detection result produced by yolo_detector.py.
+    Build it with DetectionItem.create() so consumers can rely on the array
+    layout and use vectorized NumPy operations (no per-box Python objects).
     """
-    frame: Any              # processed / annotated frame
-    boxes: Any              # list/array of bounding boxes
-    scores: Any             # list/array of confidence scores
-    labels: Any             # list/array of class labels
-    timestamp: float        # usually same as corresponding DetectionItem
-    meta: Dict[str, Any]
-
-
-@dataclass
-class DetectionItem:
-    """Detection result produced by yolo_detector.py."""
-    boxes: Any              # list/array of bounding boxes
-    scores: Any             # list/array of confidence scores
-    labels: Any             # list/array of class labels
+    boxes: Any              # numpy.ndarray float32 [N, 4] (x1, y1, x2, y2)
+    scores: Any             # numpy.ndarray float32 [N] confidence scores
+    labels: Any             # numpy.ndarray int32 [N] class ids
     timestamp: float        # time of the processed frame
-    meta: Dict[str, Any]
+    meta: Mapping[str, Any] # read-only view (MappingProxyType)
+    has_detection: bool     # len(boxes) > 0, computed once by create()
+
+    @classmethod
+    def create(
+        cls,
+        boxes: Any,
+        scores: Any,
+        labels: Any,
+        timestamp: float,
+        meta: Mapping[str, Any],
+    ) -> "DetectionItem":
+        """
+        Typed constructor: coerces boxes/scores/labels to the ndarray layout
+        above. np.asarray() returns inputs that already match without copying.
+        Also precomputes has_detection so consumers never re-derive it.
+        """
+        if np is not None:
+            boxes = np.asarray(boxes, dtype=np.float32).reshape(-1, 4)
+            scores = np.asarray(scores, dtype=np.float32).reshape(-1)
+            labels = np.asarray(labels, dtype=np.int32).reshape(-1)
+        return cls(boxes, scores, labels, timestamp, meta, len(boxes) > 0)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ErrorEntry:
     """Structured error log entry for logger.py / watchdog.py."""
     timestamp: float
@@ -67,6 +100,457 @@ class ErrorEntry:
     details: Optional[str] = None
 
 
+# Sentinel for registry lookups where None is a valid stored value
+_MISSING = object()
+
+# Shared read-only meta for items pushed without any
+_EMPTY_META: Mapping[str, Any] = MappingProxyType({})
+
+# Immutable value types that get_state() may return without taking the lock:
+# a single dict lookup is atomic under the GIL and these values cannot be torn.
+# MappingProxyType covers the read-only merged 'config'.
+_LOCK_FREE_STATE_TYPES = frozenset({bool, int, float, str, type(None), tuple, MappingProxyType})
+
+# Scalar types compared by value (not only identity) when set_state() checks
+# whether a write actually changes anything.
+_SCALAR_STATE_TYPES = frozenset({bool, int, float, str})
+
+
+# ---------------------------------------------------------------------------
+# Specialized channels (detection handoff / camera frames / error log)
+# ---------------------------------------------------------------------------
+
+class RingBuffer:
+    """
+    Bounded FIFO ring with power-of-two capacity and mask-based indexing.
+
+    Used instead of queue.Queue for detect_queue: one short critical section
+    per operation (no separate not_full/all_tasks_done conditions, no
+    unfinished-task bookkeeping). CPython exposes no compare-and-swap, so the
+    head/tail update is guarded by a single Lock; the Condition built on it is
+    only waited on by blocking get() calls.
+
+    The get()/get_nowait()/qsize()/full()/empty() subset mirrors queue.Queue
+    (including raising queue.Empty), so the DataBus generic queue helpers work
+    on it unchanged.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        if capacity < 1:
+            raise ValueError("RingBuffer capacity must be >= 1")
+        # Round up to the next power of two so index wrapping is a mask.
+        size = 1 << (capacity - 1).bit_length()
+        self.maxsize: int = size
+        self._mask = size - 1
+        self._buf: List[Any] = [None] * size
+        self._head = 0  # next slot to read (monotonic)
+        self._tail = 0  # next slot to write (monotonic)
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+
+    def put(self, item: Any, drop_oldest: bool = False) -> bool:
+        """
+        Append an item. When full, either overwrite the oldest item
+        (drop_oldest=True) or reject the new one. Never blocks.
+        Returns True if the item was stored.
+        """
+        with self._lock:
+            if self._tail - self._head > self._mask:
+                if not drop_oldest:
+                    return False
+                self._buf[self._head & self._mask] = None
+                self._head += 1
+            self._buf[self._tail & self._mask] = item
+            self._tail += 1
+            self._not_empty.notify()
+            return True
+
+    def get(self, block: bool = True, timeout: Optional[float] = None) -> Any:
+        """Remove and return the oldest item. Raises queue.Empty like queue.Queue."""
+        with self._lock:
+            if self._tail == self._head:
+                if not block:
+                    raise queue.Empty
+                self._not_empty.wait_for(lambda: self._tail != self._head, timeout)
+                if self._tail == self._head:
+                    raise queue.Empty
+            idx = self._head & self._mask
+            item = self._buf[idx]
+            self._buf[idx] = None
+            self._head += 1
+            return item
+
+    def get_nowait(self) -> Any:
+        return self.get(block=False)
+
+    def drain_into(self, out: List[Any], max_items: Optional[int] = None) -> int:
+        """
+        Non-blocking bulk get: move up to max_items of the oldest items into out
+        under a single lock acquisition. Returns how many were moved.
+        """
+        buf = self._buf
+        mask = self._mask
+        append = out.append
+        with self._lock:
+            head = self._head
+            n = self._tail - head
+            if max_items is not None and n > max_items:
+                n = max_items
+            for i in range(head, head + n):
+                idx = i & mask
+                append(buf[idx])
+                buf[idx] = None
+            self._head = head + n
+        return n
+
+    def qsize(self) -> int:
+        return self._tail - self._head
+
+    def empty(self) -> bool:
+        return self._tail == self._head
+
+    def full(self) -> bool:
+        return self._tail - self._head > self._mask
+
+
+class SpscRing:
+    """
+    Lock-free single-producer / single-consumer ring (camera -> detector).
+
+    Power-of-two capacity with mask-based indexing. Each slot holds a
+    (sequence, item) tuple; under the GIL a slot store/load and the head/tail
+    integer updates are atomic, so put/get take no lock. The producer only
+    advances the tail and the consumer only advances the head. When full,
+    put(drop_oldest=True) overwrites the oldest slot; the consumer detects the
+    overwrite from the slot's sequence number and skips ahead. With capacity 1
+    this is a latest-wins slot.
+
+    A threading.Event is only used for blocking get(): the producer sets it
+    only while the consumer is actually waiting, never per operation.
+
+    Exposes the same queue.Queue-like subset as RingBuffer (get/get_nowait
+    raising queue.Empty, qsize/empty/full) for the DataBus queue helpers.
+    """
+
+    def __init__(self, capacity: int = 1) -> None:
+        if capacity < 1:
+            raise ValueError("SpscRing capacity must be >= 1")
+        size = 1 << (capacity - 1).bit_length()
+        self.maxsize: int = size
+        self._mask = size - 1
+        self._buf: List[Any] = [(-1, None)] * size
+        self._head = 0  # next sequence to read (consumer-owned)
+        self._tail = 0  # next sequence to write (producer-owned)
+        self._waiting = False
+        self._data_ready = threading.Event()
+
+    def put(self, item: Any, drop_oldest: bool = False) -> bool:
+        """
+        Publish an item (producer thread only). Never blocks. When full, either
+        overwrite the oldest item (drop_oldest=True) or reject the new one.
+        """
+        tail = self._tail
+        if not drop_oldest and tail - self._head > self._mask:
+            return False
+        self._buf[tail & self._mask] = (tail, item)
+        self._tail = tail + 1
+        if self._waiting:
+            self._data_ready.set()
+        return True
+
+    def _try_get(self) -> Any:
+        """Take the oldest unread item, or return _MISSING (consumer thread only)."""
+        while True:
+            head, tail = self._head, self._tail
+            if head == tail:
+                return _MISSING
+            if tail - head > self._mask:
+                # Lapped by the producer: the oldest entries were overwritten
+                head = tail - self._mask - 1
+            seq, item = self._buf[head & self._mask]
+            if seq != head:
+                # Overwritten between the tail read and the slot read: retry
+                # (the fresh tail then shows the lap). Slots are never cleared
+                # by the consumer, so it cannot race with the producer's store.
+                continue
+            self._head = head + 1
+            return item
+
+    def get(self, block: bool = True, timeout: Optional[float] = None) -> Any:
+        """Take the oldest item. Raises queue.Empty like queue.Queue."""
+        item = self._try_get()
+        if item is not _MISSING or not block:
+            if item is _MISSING:
+                raise queue.Empty
+            return item
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            # Announce the wait, then re-check: a put() that lands in between
+            # either is seen by the re-check or sees _waiting and sets the Event.
+            self._waiting = True
+            self._data_ready.clear()
+            item = self._try_get()
+            if item is _MISSING:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is None or remaining > 0:
+                    self._data_ready.wait(remaining)
+                    item = self._try_get()
+            self._waiting = False
+            if item is not _MISSING:
+                return item
+            if deadline is not None and time.monotonic() >= deadline:
+                raise queue.Empty
+
+    def get_nowait(self) -> Any:
+        return self.get(block=False)
+
+    def peek_latest(self) -> Any:
+        """
+        Newest published item without consuming anything (any thread), or None
+        if the ring is empty. O(1): a direct read of slot tail - 1.
+        """
+        while True:
+            tail = self._tail
+            if tail == self._head:
+                return None
+            seq, item = self._buf[(tail - 1) & self._mask]
+            if seq == tail - 1:
+                return item
+            # Overwritten by a newer put meanwhile: re-read the tail
+
+    def consume_to_latest(self) -> Any:
+        """
+        Consumer thread only: return the newest item and mark everything up to
+        it as consumed (head := tail) in O(1). Raises queue.Empty if empty.
+        """
+        while True:
+            tail = self._tail
+            if tail == self._head:
+                raise queue.Empty
+            seq, item = self._buf[(tail - 1) & self._mask]
+            if seq == tail - 1:
+                self._head = tail
+                return item
+
+    def qsize(self) -> int:
+        return min(self._tail - self._head, self.maxsize)
+
+    def empty(self) -> bool:
+        return self._tail == self._head
+
+    def full(self) -> bool:
+        return self._tail - self._head > self._mask
+
+
+class BoundedLatestDeque:
+    """
+    Bounded FIFO that keeps the newest items (deque(maxlen=N) + Condition).
+
+    put(drop_oldest=True) is a single append: the deque evicts the oldest item
+    itself, in O(1), instead of queue.Queue's full() / get_nowait() / put()
+    sequence (three mutex acquires and a race window between them). Items are
+    consumed from the left (oldest first).
+
+    The drop-oldest append takes no lock at all (deque.append is atomic under
+    the GIL, so any number of producers may push concurrently): a producer can
+    never be stalled by a consumer. The Condition is only acquired to wake a
+    consumer that is actually blocked in get().
+
+    Same queue.Queue-like subset as RingBuffer for the DataBus queue helpers.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = max(1, int(maxsize))
+        self._items: collections.deque = collections.deque(maxlen=self.maxsize)
+        self._not_empty = threading.Condition(threading.Lock())
+        self._waiters = 0  # consumers blocked in get(), guarded by _not_empty
+
+    def put(self, item: Any, drop_oldest: bool = False) -> bool:
+        """
+        Append item. Never blocks: when full, either evict the oldest item
+        (drop_oldest=True, lock-free) or reject the new one (returns False).
+        """
+        if drop_oldest:
+            self._items.append(item)
+            # A consumer registers as a waiter before re-checking _items, so
+            # seeing no waiter here means it will find the new item itself.
+            if self._waiters:
+                with self._not_empty:
+                    self._not_empty.notify()
+            return True
+        with self._not_empty:
+            if len(self._items) >= self.maxsize:
+                return False
+            self._items.append(item)
+            self._not_empty.notify()
+        return True
+
+    def get(self, block: bool = True, timeout: Optional[float] = None) -> Any:
+        """Pop the oldest item. Raises queue.Empty like queue.Queue."""
+        with self._not_empty:
+            if not self._items:
+                if not block:
+                    raise queue.Empty
+                self._waiters += 1
+                try:
+                    self._not_empty.wait_for(lambda: self._items, timeout)
+                finally:
+                    self._waiters -= 1
+                if not self._items:
+                    raise queue.Empty
+            return self._items.popleft()
+
+    def get_nowait(self) -> Any:
+        return self.get(block=False)
+
+    def qsize(self) -> int:
+        return len(self._items)
+
+    def empty(self) -> bool:
+        return not self._items
+
+    def full(self) -> bool:
+        return len(self._items) >= self.maxsize
+
+
+# Any channel accepted by the DataBus queue helpers
+Channel = Union[queue.Queue, RingBuffer, SpscRing, BoundedLatestDeque]
+
+
+class FramePool:
+    """
+    Free-list of recycled frame buffers (allocFrame/releaseFrame pattern).
+
+    The camera acquires a buffer and decodes into it, and the frame travels by
+    reference (zero-copy) through image_queue. Ownership is explicit: a buffer
+    returns to the pool only through release(), called by its last consumer
+    once it holds the only reference. A frame published as the latest
+    annotated frame is never released, since the logger/HTTP server may still
+    read it; the pool then simply allocates anew.
+    deque append/pop are atomic under the GIL; capacity caps retained memory.
+    Buffers of another shape/dtype (resolution change) are discarded.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = max(1, int(capacity))
+        self._free: collections.deque = collections.deque(maxlen=self.capacity)
+
+    def acquire(self, shape: Tuple[int, ...], dtype: Any = None) -> Optional[Any]:
+        """
+        A recycled buffer with the given shape (and dtype, if given), or None
+        if none is free; the caller then allocates a fresh one (e.g.
+        cv2.VideoCapture.retrieve() allocates when given None).
+        """
+        try:
+            buf = self._free.pop()
+        except IndexError:
+            return None
+        if getattr(buf, "shape", None) != tuple(shape):
+            return None
+        if dtype is not None and getattr(buf, "dtype", None) != dtype:
+            return None
+        return buf
+
+    def release(self, buf: Any) -> None:
+        """Return a buffer; the caller must not keep (or publish) any reference to it."""
+        if buf is not None:
+            self._free.append(buf)
+
+    def __len__(self) -> int:
+        return len(self._free)
+
+
+class SharedJpegBuffer:
+    """
+    Latest encoded JPEG in a fixed-size mmap (single writer, many readers).
+
+    Layout: [sequence u64][length u32][payload ...]. Writes follow a seqlock:
+    the sequence is odd while the payload is being rewritten and even once it
+    is consistent, so readers never take a lock; they retry if the sequence
+    moved under them. With a path (e.g. under /dev/shm) the mapping is
+    file-backed and can be read by other processes as well; otherwise it is an
+    anonymous mapping. The writer owns the file: close() removes it.
+    """
+
+    _HEADER = struct.Struct("<QI")
+
+    def __init__(self, capacity: int, path: Optional[str] = None) -> None:
+        self.capacity = int(capacity)
+        size = self._HEADER.size + self.capacity
+        if path:
+            fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                os.ftruncate(fd, size)
+                self._mm = mmap.mmap(fd, size)
+            finally:
+                os.close(fd)
+        else:
+            self._mm = mmap.mmap(-1, size)
+        self._path = path or None
+        self._HEADER.pack_into(self._mm, 0, 0, 0)
+        self._seq = 0
+
+    def close(self) -> None:
+        """
+        Reset the header to "nothing published" (so a process still mapping the
+        file does not keep serving the last frame), unmap, and remove the
+        backing file. Call once the writer and in-process readers are done;
+        later writes are dropped and reads return nothing. Idempotent.
+        """
+        mm = self._mm
+        if mm.closed:
+            return
+        self._HEADER.pack_into(mm, 0, 0, 0)
+        mm.close()
+        if self._path:
+            try:
+                os.unlink(self._path)
+            except FileNotFoundError:
+                pass
+            self._path = None
+
+    @property
+    def sequence(self) -> int:
+        """Number of completed writes x 2 (0 = nothing published yet)."""
+        return self._seq
+
+    def write(self, data: Any) -> bool:
+        """
+        Publish data (bytes-like, e.g. the ndarray returned by cv2.imencode).
+        Returns False (buffer unchanged) if it does not fit in capacity.
+        Must only be called from one thread.
+        """
+        view = memoryview(data).cast("B")
+        n = view.nbytes
+        if n > self.capacity or self._mm.closed:
+            return False
+        h = self._HEADER.size
+        self._HEADER.pack_into(self._mm, 0, self._seq + 1, 0)
+        self._mm[h:h + n] = view
+        self._seq += 2
+        self._HEADER.pack_into(self._mm, 0, self._seq, n)
+        return True
+
+    def read(self, retries: int = 3) -> Tuple[int, Optional[bytes]]:
+        """
+        Return (sequence, payload copy) of the last complete write, or
+        (sequence, None) if nothing was published or the writer kept racing.
+        """
+        if self._mm.closed:
+            return 0, None
+        h = self._HEADER.size
+        for _ in range(retries):
+            seq, n = self._HEADER.unpack_from(self._mm, 0)
+            if seq == 0:
+                return 0, None
+            if seq & 1:
+                continue
+            data = self._mm[h:h + n]
+            if self._HEADER.unpack_from(self._mm, 0)[0] == seq:
+                return seq, data
+        return self._seq, None
+
+
 # ---------------------------------------------------------------------------
 # Configuration Definition (Simplified structure for demonstration)
 # ---------------------------------------------------------------------------
@@ -77,7 +561,8 @@ DEFAULT_CONFIG_STRUCTURE = {
     "camera_req_width": None,
     "camera_req_height": None,
     "camera_period_s": 0.0,
-    "camera_fourcc": None,
+    "camera_fourcc": "MJPG",            # compressed on the wire (None = driver default, usually YUYV)
+    "camera_fps": 30,                   # requested sensor frame rate (None = driver default)
     "camera_buffer_size": 1,
     "camera_max_consecutive_fail": 5, # From BaseModule
 
@@ -86,14 +571,28 @@ DEFAULT_CONFIG_STRUCTURE = {
     "yolo_input_img_size": 640,
     "yolo_conf_threshold": 0.25,
     "yolo_iou_threshold": 0.45,
-    "yolo_bgr_to_rgb_conversion": False,
+    "yolo_bgr_to_rgb_conversion": False, # False: model gets RGB (standard weights); True: BGR as captured
     "yolo_queue_timeout_s": 0.1,
+    "yolo_batch_size": 1,               # frames per inference call (1 = latest frame only)
+    "yolo_batch_flush_timeout_s": 0.05, # max wait to fill a batch after its first frame
+    "yolo_publish_jpeg": True,          # encode annotated frames into DataBus.jpeg_buffer
+    "yolo_jpeg_quality": 90,
+    "yolo_jpeg_max_width": 640,         # published JPEG is downscaled to this width (None = full size)
     "yolo_max_consecutive_fail": 5, # From BaseModule
 
+    # --- MotorWithLora Configuration (pins/timing are constants in motor_with_lora.py) ---
+    "motor_cpu_core": None,             # pin the motor thread to this core (None = no pinning)
+    "motor_rt_priority": None,          # SCHED_FIFO priority for the motor thread (None = normal)
+    "motor_serial_port": "/dev/serial0", # LoRa alert UART
+    "motor_serial_baud": 9600,
+
     # --- HttpServerModule Configuration ---
     "http_server_host": "127.0.0.1",
     "http_server_port": 5000,
     "http_server_poll_interval": 1.0,
+    "http_server_jpeg_quality": 90,     # fallback encode (only when the detector does not publish JPEGs)
+    "http_server_stream_max_width": 640, # width of the server's own fallback JPEGs (None = full size)
+    "http_server_threads": 8,           # waitress worker threads (each /stream client holds one)
     # Export config is complex; using a simplified list of keys for demonstration
     "http_server_export_config_keys": ["motor_location", "deter_flag"], 
     "http_server_max_consecutive_fail": 5, # From BaseModule
@@ -112,45 +611,112 @@ class DataBus:
     def __init__(
         self,
         config_override: Optional[Dict[str, Any]] = None,
-        image_queue_size: int = 3,
-        detect_queue_size: int = 20,
+        # [REMOVED] image_queue_size: image_queue is now a single latest-wins slot.
+        detect_queue_size: int = 32,
         # [REMOVED] processed_image_queue_size argument is no longer needed.
-        error_queue_size: int = 200,
+        error_queue_size: int = 256,
+        detection_log_size: int = 1024,
+        frame_pool_size: Optional[int] = None,
+        jpeg_shm_size: int = 1 << 20,
+        jpeg_shm_path: Optional[str] = None,
     ) -> None:
+        # Merge configuration first: the image_queue layout depends on it.
+        # The merged config is frozen behind a read-only view, so get_state("config")
+        # hands out the same object to every module without copying or locking.
+        initial_config: Mapping[str, Any] = MappingProxyType(
+            {**DEFAULT_CONFIG_STRUCTURE, **(config_override or {})}
+        )
+        yolo_batch_size = max(1, int(initial_config.get("yolo_batch_size", 1)))
+
         # Bounded queues for streaming data
-        self.image_queue: queue.Queue = queue.Queue(maxsize=image_queue_size)
-        self.detect_queue: queue.Queue = queue.Queue(maxsize=detect_queue_size)
+        # Camera -> YOLO handoff (single producer, single consumer, lock-free):
+        # single-frame inference only ever wants the newest frame (capacity 1 =
+        # latest-wins); batched inference needs a short FIFO instead.
+        self.image_queue: SpscRing = SpscRing(2 * yolo_batch_size if yolo_batch_size > 1 else 1)
+        # Detection handoff uses a fixed-capacity ring. Sizes are powers of two
+        # (other values are rounded up) so slot indices are head & (cap - 1).
+        self.detect_queue: RingBuffer = RingBuffer(detect_queue_size)
+        # Pre-bound put for the per-frame push (skips the attribute lookups)
+        self._detect_put: Callable[..., bool] = self.detect_queue.put
         # [REMOVED] self.processed_image_queue definition is removed.
-        self.error_log: queue.Queue = queue.Queue(maxsize=error_queue_size)
+        # Error log keeps the newest entries: drop-oldest is a single deque append
+        self.error_log: BoundedLatestDeque = BoundedLatestDeque(error_queue_size)
+        # Per-frame detection events, (timestamp, module, object count) tuples:
+        # kept apart from error_log so a sustained detection cannot evict real
+        # warnings, and formatted only by the logger (see push_detection_event)
+        self.detection_log: collections.deque = collections.deque(maxlen=max(1, detection_log_size))
+
+        # Latest annotated frame as encoded JPEG (written by the detector, read by
+        # the HTTP server). jpeg_shm_path=None uses an anonymous mapping.
+        self.jpeg_buffer: SharedJpegBuffer = SharedJpegBuffer(jpeg_shm_size, jpeg_shm_path)
+        # New-JPEG notification for /stream clients; the publisher only takes the
+        # Condition when someone is waiting (see wait_for_jpeg).
+        self._jpeg_cond = threading.Condition(threading.Lock())
+        self._jpeg_waiters = 0
+        self._jpeg_cache: Tuple[int, Optional[bytes]] = (0, None) # see read_jpeg
 
         # ------------------------------------------------------------------
         # Unified Registry for ALL Shared State and Module Resources
         # ------------------------------------------------------------------
         self._registry_lock = threading.Lock()
         self._registry: Dict[str, Any] = {}
+        # Lock shards for the high-rate keys: writers of different hot keys (and
+        # of everything else under _registry_lock) never serialize on each other.
+        # A single dict store is atomic under the GIL; a shard only orders the
+        # read-compare-write of its own key.
+        self._state_locks: Dict[str, threading.Lock] = {
+            "motor_location": threading.Lock(),
+            "deter_flag": threading.Lock(),
+            "latest_annotated_frame": threading.Lock(),
+        }
         
-        # Condition variable for state change notifications
-        self._state_condition = threading.Condition(self._registry_lock) 
+        # Event for state change notifications (deter_flag False -> True edge).
+        # Independent of _registry_lock, so waiters never contend with writers.
+        self._deter_event = threading.Event()
+        # Per-waiter Events (register_state_waiter), also set on that edge. A
+        # tuple replaced on registration, so set_state iterates it without a lock.
+        self._state_waiters: Tuple[threading.Event, ...] = ()
+
+        # Hot keys mirrored into plain attributes (written under their shard lock
+        # by set_state/update_state, read lock-free via the dedicated accessors)
+        self._deter_flag: bool = False
+        self._motor_location: Dict[str, Any] = {}
+
+        # Changes on every state write (set_state/update_state/annotated frame).
+        # Values come from a shared counter (next() is atomic under the GIL), so
+        # two writes never publish the same version: readers can cache derived
+        # data and skip rebuilding it while the version is unchanged.
+        self._state_versions = itertools.count(1)
+        self.state_version: int = 0
 
-        # 1. Initialize 'config' as a core state attribute, allowing overrides
-        initial_config = dict(DEFAULT_CONFIG_STRUCTURE)
-        if config_override:
-            initial_config.update(config_override)
+        # 1. Initialize 'config' as a core state attribute (overrides merged above, read-only)
         self.set_state("config", initial_config)
         
         # 2. Initialize core dynamic states 
         self.set_state("motor_location", {})
         self.set_state("deter_flag", False)
-        # [NEW] Initialize the registry key for the latest processed image snapshot
-        self.set_state("latest_processed_image_item", None)
-        
-        # Lock for pushing detection + processed image together
-        # Note: This lock now only protects the detect_queue put operation.
-        self._det_proc_lock = threading.Lock()
+        # Latest annotated frame snapshot: None or (annotated_frame, DetectionItem)
+        self.set_state("latest_annotated_frame", None)
+
+        # 3. Shared frame buffer pool (registry resource). Default capacity covers
+        # every frame that can be in flight: the image_queue slots, a batch being
+        # inferred, and the frame being captured.
+        if frame_pool_size is None:
+            frame_pool_size = self.image_queue.maxsize + yolo_batch_size + 1
+        self.frame_pool: FramePool = self.get_or_create("frame_pool", lambda: FramePool(frame_pool_size))
 
         # Per-module health (for watchdog/http_server)
-        self._health_lock = threading.Lock()
+        # One slot per module, written only by that module (no lock: under the GIL
+        # a dict.update() with str keys is atomic, and slots are never removed)
         self._module_health: Dict[str, Dict[str, Any]] = {}
+        # Published read-only copy of _module_health, rebuilt lazily when the
+        # health version moved; only the slots whose own version moved are copied.
+        self._health_published: Dict[str, Dict[str, Any]] = {}
+        self._health_versions = itertools.count(1)
+        self._health_slot_versions: Dict[str, int] = {} # module -> version of its last update
+        self._health_published_versions: Dict[str, int] = {}
+        self._health_published_version: int = 0
+        self.health_version: int = 0 # changes on every update_module_health()
 
     # ------------------------------------------------------------------
     # Generic queue helpers
@@ -158,25 +724,49 @@ class DataBus:
 
     def queue_put(
         self,
-        q: queue.Queue,
+        q: Channel,
         item: Any,
         drop_oldest_if_full: bool = False,
     ) -> None:
         """
         Put an item into a queue. If bounded and drop_oldest_if_full is True,
         it non-blockingly removes the oldest item if the queue is full.
+        A RingBuffer/BoundedLatestDeque never blocks: without drop_oldest_if_full
+        a full one rejects the new item (with it, the deque evicts the oldest in
+        the same append). A SpscRing behaves the same, overwriting the oldest
+        slot when full (capacity 1: always replaces the pending item).
+        RingBuffer/SpscRing capacities are powers of two, so drop-oldest is a
+        masked index (head & (cap - 1)) rather than a modulo. For a plain
+        queue.Queue the drop-oldest path is a single critical section on the
+        queue internals; subclasses (LifoQueue/PriorityQueue keep a list, with a
+        different "oldest") go through get_nowait().
         """
-        if drop_oldest_if_full and q.maxsize > 0 and q.full():
-            try:
-                q.get_nowait()
-            except queue.Empty:
-                # Race condition; safe to ignore.
-                pass
+        if isinstance(q, (RingBuffer, SpscRing, BoundedLatestDeque)):
+            q.put(item, drop_oldest=drop_oldest_if_full)
+            return
+        if drop_oldest_if_full:
+            if type(q) is queue.Queue:
+                # Atomic check-and-pop under the queue's own mutex: no full()/get_nowait()
+                # race to guard against, so no try/except on the producer path.
+                with q.mutex:
+                    items = q.queue
+                    if q.maxsize > 0 and len(items) >= q.maxsize:
+                        items.popleft()
+                    items.append(item)
+                    q.unfinished_tasks += 1  # same bookkeeping as Queue.put()
+                    q.not_empty.notify()
+                return
+            if q.maxsize > 0 and q.full():
+                try:
+                    q.get_nowait()
+                except queue.Empty:
+                    # Race condition; safe to ignore.
+                    pass
         q.put(item)
 
     def queue_get(
         self,
-        q: queue.Queue,
+        q: Channel,
         timeout: Optional[float] = None,
     ) -> Optional[Any]:
         """
@@ -195,27 +785,134 @@ class DataBus:
 
     def drain_queue(
         self,
-        q: queue.Queue,
+        q: Channel,
         max_items: Optional[int] = None,
     ) -> List[Any]:
         """
         Non-blocking drain of a queue. Returns a list of items.
         """
         items: List[Any] = []
-        while max_items is None or len(items) < max_items:
+        self.drain_queue_into(q, items, max_items)
+        return items
+
+    def drain_queue_into(
+        self,
+        q: Channel,
+        out: List[Any],
+        max_items: Optional[int] = None,
+    ) -> int:
+        """
+        Non-blocking drain of a queue into a caller-owned list (the caller
+        clears and reuses it), so per-cycle drains allocate no new list.
+        Appends at most max_items items and returns how many were appended.
+        RingBuffer and plain queue.Queue are drained in bulk (see bulk_drain);
+        other channels, including queue.Queue subclasses, item by item.
+        """
+        if isinstance(q, RingBuffer):
+            return q.drain_into(out, max_items)
+        if type(q) is queue.Queue:
+            items = self.bulk_drain(q, max_items)
+            out.extend(items)
+            return len(items)
+
+        append = out.append
+        get_nowait = q.get_nowait
+        n = 0
+        while max_items is None or n < max_items:
             try:
-                item = q.get_nowait()
+                append(get_nowait())
             except queue.Empty:
                 break
-            items.append(item)
+            n += 1
+        return n
+
+    def bulk_drain(
+        self,
+        q: Channel,
+        max_items: Optional[int] = None,
+    ) -> List[Any]:
+        """
+        Non-blocking drain of up to max_items items with a single lock
+        acquisition, instead of one get_nowait() mutex cycle per item.
+
+        For a plain queue.Queue this works on its (CPython-stable) internals:
+        the internal deque is popped under q.mutex and blocked producers are
+        woken once via not_full. RingBuffer uses its own drain_into(); other
+        channel types, and queue.Queue subclasses (LifoQueue/PriorityQueue keep
+        a list and define their own get order), fall back to drain_queue_into().
+        """
+        if type(q) is queue.Queue:
+            with q.mutex:
+                items_deque = q.queue
+                n = len(items_deque)
+                if max_items is not None and n > max_items:
+                    n = max_items
+                popleft = items_deque.popleft
+                items = [popleft() for _ in range(n)]
+                if n:
+                    q.not_full.notify(n)
+            return items
+        items: List[Any] = []
+        self.drain_queue_into(q, items, max_items)
         return items
 
-    def get_latest_from_queue(self, q: queue.Queue) -> Optional[Any]:
+    def queue_size(self, q: Channel) -> int:
         """
-        Non-blocking helper that returns the last available item in a queue.
-        Used for UI modules that only care about the most recent state.
-        (Retained for image_queue/error_log usage, but not for processed images).
+        Relaxed (lock-free, possibly momentarily stale) item count of a queue.
+        RingBuffer/SpscRing/BoundedLatestDeque sizes are plain attribute or
+        len() reads; for queue.Queue the internal deque length is read directly
+        (len() is atomic under the GIL) instead of qsize(), which acquires the
+        queue mutex.
         """
+        if isinstance(q, queue.Queue):
+            return len(q.queue)
+        return q.qsize()
+
+    def push_error(
+        self,
+        module: str,
+        level: str,
+        message: str,
+        details: Optional[str] = None,
+        timestamp: Optional[float] = None,
+    ) -> None:
+        """
+        Record an ErrorEntry in error_log. Never blocks: the entry is appended
+        without a lock and, when the log is full, the oldest entry is dropped, so
+        a stalled logger cannot back-pressure the camera/detection threads.
+        """
+        entry = ErrorEntry(
+            timestamp=time.time() if timestamp is None else timestamp,
+            module=module,
+            level=level,
+            message=message,
+            details=details,
+        )
+        self.error_log.put(entry, drop_oldest=True)
+
+    def push_detection_event(self, module: str, count: int, timestamp: float) -> None:
+        """
+        Record that module detected count objects in the frame captured at
+        timestamp. A single deque.append of a tuple (atomic under the GIL, no
+        lock, no ErrorEntry or message string); the oldest event is dropped when
+        the log is full. The logger drains these into the error log as INFO.
+        """
+        self.detection_log.append((timestamp, module, count))
+
+    def get_latest_from_queue(self, q: Channel) -> Optional[Any]:
+        """
+        Non-blocking helper that returns the last available item in a queue,
+        discarding the older ones. Used for UI modules that only care about the
+        most recent state. (Retained for image_queue/error_log usage, but not
+        for processed images.)
+        On a SpscRing (image_queue) this is an O(1) read of the newest slot;
+        other channels are drained item by item.
+        """
+        if isinstance(q, SpscRing):
+            try:
+                return q.consume_to_latest()
+            except queue.Empty:
+                return None
         latest: Any = None
         got_any = False
         while True:
@@ -227,6 +924,86 @@ class DataBus:
             got_any = True
         return latest if got_any else None
 
+    # ------------------------------------------------------------------
+    # Frame buffer pool
+    # ------------------------------------------------------------------
+
+    def acquire_frame_buffer(self, shape: Tuple[int, ...]) -> Optional[Any]:
+        """
+        Return a recycled frame buffer (e.g. numpy.ndarray) with the given shape,
+        or None if the pool has none; the caller then allocates a fresh one
+        (e.g. cv2.VideoCapture.retrieve() allocates when given None).
+        Buffers of a different shape are discarded. (See FramePool.)
+        """
+        return self.frame_pool.acquire(shape)
+
+    def release_frame_buffer(self, buf: Any) -> None:
+        """
+        Return a frame buffer to the pool once its last reader is done with it.
+        The caller must not keep (or publish) any reference to buf afterwards.
+        """
+        self.frame_pool.release(buf)
+
+    # ------------------------------------------------------------------
+    # Encoded JPEG export (shared memory)
+    # ------------------------------------------------------------------
+
+    def publish_jpeg(self, jpeg: Any) -> bool:
+        """
+        Publish the encoded JPEG of the latest annotated frame. Single writer
+        (the detector). Returns False if it exceeds the buffer capacity.
+        """
+        if not self.jpeg_buffer.write(jpeg):
+            return False
+        # A waiter registers before re-checking the sequence, so seeing none
+        # here means it will find the new frame itself.
+        if self._jpeg_waiters:
+            with self._jpeg_cond:
+                self._jpeg_cond.notify_all()
+        return True
+
+    def close(self) -> None:
+        """
+        Release the shared-memory JPEG buffer (and its /dev/shm file, if any).
+        Call once after all modules have been stopped and joined.
+        """
+        self.jpeg_buffer.close()
+
+    def read_jpeg(self) -> Tuple[int, Optional[bytes]]:
+        """
+        Lock-free read of the latest published JPEG: (sequence, bytes or None).
+        The sequence changes on every publish, so callers can detect new frames.
+
+        The bytes of the current sequence are copied out of the buffer once and
+        shared by every reader (e.g. several /stream clients) until the next
+        publish. The cache is a single (sequence, bytes) tuple swapped by
+        reference; racing readers at worst both copy.
+        """
+        cached = self._jpeg_cache
+        if cached[0] and cached[0] == self.jpeg_buffer.sequence:
+            return cached
+        seq, data = self.jpeg_buffer.read()
+        if data is not None:
+            self._jpeg_cache = (seq, data)
+        return seq, data
+
+    def wait_for_jpeg(self, last_sequence: int, timeout: float) -> int:
+        """
+        Block until a JPEG newer than last_sequence is published or the timeout
+        expires, and return the current sequence (unchanged on timeout). Any
+        number of readers (one per /stream client) can wait concurrently.
+        """
+        buf = self.jpeg_buffer
+        if buf.sequence != last_sequence:
+            return buf.sequence
+        with self._jpeg_cond:
+            self._jpeg_waiters += 1
+            try:
+                self._jpeg_cond.wait_for(lambda: buf.sequence != last_sequence, timeout)
+            finally:
+                self._jpeg_waiters -= 1
+        return buf.sequence
+
     # ------------------------------------------------------------------
     # Detection + processed-image paired push helper
     # ------------------------------------------------------------------
@@ -239,44 +1016,54 @@ class DataBus:
         processed_frame: Any,
         meta: Optional[Dict[str, Any]] = None,
         drop_oldest_if_full: bool = False,
+        timestamp: Optional[float] = None,
     ) -> None:
         """
         Push a detection result to detect_queue AND store the corresponding 
-        processed frame item as the latest state snapshot in the registry.
+        annotated frame as the latest state snapshot in the registry.
+
+        timestamp should be the capture time of the source frame
+        (ImageItem.timestamp), so detections line up with their images; it
+        defaults to time.time() for callers without one.
+
+        The snapshot is the pair (processed_frame, det_item): the frame is kept
+        by reference and the detection data is not duplicated into a second
+        dataclass. Both are published with a single registry store so readers
+        never see a frame paired with another frame's detections.
+
+        Single producer (the detector thread): program order alone keeps
+        detect_queue and the snapshot aligned, so the only lock taken is the
+        ring's own.
         """
-        if meta is None:
-            meta = {}
+        # One read-only view over the caller's dict, no copy (neither consumer
+        # mutates meta; the caller hands the dict over).
+        shared_meta = MappingProxyType(meta) if meta else _EMPTY_META
 
-        timestamp = time.time()
+        if timestamp is None:
+            timestamp = time.time()
 
-        det_item = DetectionItem(
+        det_item = DetectionItem.create(
             boxes=boxes,
             scores=scores,
             labels=labels,
             timestamp=timestamp,
-            meta=dict(meta),
-        )
-        img_item = ProcessedImageItem(
-            frame=processed_frame,
-            boxes=boxes,
-            scores=scores,
-            labels=labels,
-            timestamp=timestamp,
-            meta=dict(meta),
+            meta=shared_meta,
         )
 
-        with self._det_proc_lock:
-            # 1. Push Detection Item to queue (for Decision Logic module)
-            self.queue_put(
-                self.detect_queue,
-                det_item,
-                drop_oldest_if_full=drop_oldest_if_full,
-            )
-            # [REMOVED] The queue_put for self.processed_image_queue is removed.
+        # Per-frame hot path: talk to the ring and the registry directly instead
+        # of going through the generic queue_put()/set_state() dispatch.
+
+        # 1. Push Detection Item to the ring (for Decision Logic module).
+        # The ring is internally synchronized, so no extra pairing lock is needed.
+        self._detect_put(det_item, drop_oldest_if_full)
 
-        # 2. Store Processed Image Item in Registry (for Logger and HTTP Server)
-        # This guarantees access to the latest item without queue contention.
-        self.set_state("latest_processed_image_item", img_item)
+        # 2. Store the annotated frame + its detection in the registry (for Logger
+        # and HTTP Server). This guarantees access to the latest frame without
+        # queue contention. (No listener is notified for this key.)
+        # A single dict store is atomic under the GIL and there is one writer,
+        # so no lock is needed here.
+        self._registry["latest_annotated_frame"] = (processed_frame, det_item)
+        self.state_version = next(self._state_versions)
 
     # ------------------------------------------------------------------
     # Unified State API
@@ -286,52 +1073,135 @@ class DataBus:
         """
         Set a generic shared state key's value. Thread-safe.
         Notifies listeners if the 'deter_flag' is set to True.
+        The value is stored by reference; do not mutate it after publishing.
+        Re-setting an unchanged value (same object, or equal scalar of the same
+        type) is a no-op: nothing is written and no listener is woken.
         """
-        with self._registry_lock:
-            old_value = self._registry.get(key)
+        with self._state_lock(key):
+            old_value = self._registry.get(key, _MISSING)
+            if old_value is value or (
+                type(value) in _SCALAR_STATE_TYPES
+                and type(old_value) is type(value)
+                and old_value == value
+            ):
+                return
             self._registry[key] = value
+            self.state_version = next(self._state_versions)
             
-            # Notify listeners if 'deter_flag' changes to True.
-            if key == "deter_flag" and value and old_value != value:
-                self._state_condition.notify_all()
+            if key == "deter_flag":
+                self._deter_flag = value
+                # Wake listeners if 'deter_flag' changes to True.
+                if value:
+                    self._deter_event.set()
+                    for waiter in self._state_waiters:
+                        waiter.set()
+                else:
+                    self._deter_event.clear()
+            elif key == "motor_location":
+                self._motor_location = value
+
+    def _state_lock(self, key: str) -> threading.Lock:
+        """Lock guarding writes of key: its own shard for hot keys, else the registry lock."""
+        return self._state_locks.get(key, self._registry_lock)
 
     def get_state(self, key: str, default: Any = None) -> Any:
         """
         Get a generic shared state key's value. Thread-safe.
-        Returns a copy of mutable objects (dict/list) if the key exists.
+
+        State values are copy-on-write snapshots: writers never mutate a stored
+        dict/list in place (update_state rebinds a new dict), so the stored
+        reference is returned directly without copying. Callers must treat the
+        returned object as read-only.
+
+        Fast path: immutable scalars (e.g. deter_flag) and tuples are returned
+        without acquiring the registry lock.
         """
-        with self._registry_lock:
-            value = self._registry.get(key, default)
-            
-            if key in self._registry:
-                # Return a copy of mutable objects (e.g., motor_location)
-                if isinstance(value, dict):
-                    return dict(value)
-                if isinstance(value, list):
-                    return list(value)
-                
+        value = self._registry.get(key, _MISSING)
+        if type(value) in _LOCK_FREE_STATE_TYPES:
             return value
+        with self._state_lock(key):
+            return self._registry.get(key, default)
+
+    def get_states(self, keys: Iterable[str], default: Any = None) -> Dict[str, Any]:
+        """
+        Read several state keys in one call: {key: value or default}. Lock-free.
+
+        Values are published by reference (copy-on-write), so every read is a
+        single atomic dict lookup. This is not an atomic multi-key snapshot;
+        compare state_version before and after to detect concurrent writes.
+        Callers must treat the returned values as read-only.
+        """
+        get = self._registry.get
+        return {key: get(key, default) for key in keys}
 
     def update_state(self, key: str, **kwargs: Any) -> None:
         """
         Atomically update a dictionary-like state item (e.g., 'motor_location').
+        Copy-on-write: a new dict is built and rebound, so snapshots previously
+        returned by get_state() are never modified.
         """
-        with self._registry_lock:
-            current_state = self._registry.setdefault(key, {})
+        with self._state_lock(key):
+            current_state = self._registry.get(key, {})
             if isinstance(current_state, dict):
-                current_state.update(kwargs)
+                new_state = {**current_state, **kwargs}
+                self._registry[key] = new_state
+                self.state_version = next(self._state_versions)
+                if key == "motor_location":
+                    self._motor_location = new_state
             else:
                 raise TypeError(f"State key '{key}' is not a dictionary and cannot be updated with kwargs.")
 
+    # ------------------------------------------------------------------
+    # Dedicated accessors for hot keys (no key hashing, no lock on read)
+    # ------------------------------------------------------------------
+
+    def get_deter_flag(self) -> bool:
+        """Current 'deter_flag' value. Lock-free attribute read."""
+        return self._deter_flag
+
+    def set_deter_flag(self, value: bool) -> None:
+        """Set 'deter_flag' (same semantics and notification as set_state)."""
+        self.set_state("deter_flag", value)
+
+    def get_motor_location(self) -> Dict[str, Any]:
+        """Current 'motor_location' snapshot (read-only). Lock-free attribute read."""
+        return self._motor_location
+
+    def set_motor_location(self, location: Dict[str, Any]) -> None:
+        """Publish a new 'motor_location' snapshot (same semantics as set_state)."""
+        self.set_state("motor_location", location)
+
     # [NEW] State change waiting mechanism
-    def wait_for_state_change(self, timeout: float) -> None:
+    def wait_for_state_change(self, timeout: float) -> bool:
         """
         Wait until a state change notification (currently only deter_flag=True) is 
-        received or the timeout expires.
+        received or the timeout expires. Returns True if notified.
+
+        The event is consumed on wake-up so that a flag that simply stays True
+        does not turn subsequent waits into a busy loop; every thread waiting at
+        the moment of the edge is still woken by Event.set().
+        """
+        if self._deter_event.wait(timeout=timeout):
+            self._deter_event.clear()
+            return True
+        return False
+
+    def register_state_waiter(self, key: str) -> threading.Event:
+        """
+        A threading.Event owned by one waiter (registered under key, e.g.
+        "logger.trigger"), set on every deter_flag False -> True edge. Only its
+        owner waits on and clears it, so, unlike wait_for_state_change(), another
+        thread's wake-up can never consume the notification. The owner may also
+        set it itself (e.g. in stop()) without waking anyone else.
         """
-        with self._state_condition:
-            # wait() releases the lock and blocks until notified or timeout
-            self._state_condition.wait(timeout=timeout)
+        def create() -> threading.Event:
+            event = threading.Event()
+            if self._deter_flag:
+                event.set()
+            self._state_waiters = self._state_waiters + (event,)
+            return event
+
+        return self.get_or_create(key, create)
 
     # ------------------------------------------------------------------
     # Generic registry for module-specific resources
@@ -341,7 +1211,15 @@ class DataBus:
         """
         Get a resource by key from the internal registry, creating it on the
         first access with the given factory. Thread-safe.
+
+        Double-checked: once the key exists it is returned by a single dict
+        read (atomic under the GIL) without taking _registry_lock; registry
+        keys are never removed, so a hit can never go stale. Only the first,
+        creating call is serialized.
         """
+        value = self._registry.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
         with self._registry_lock:
             if key not in self._registry:
                 self._registry[key] = factory()
@@ -365,20 +1243,61 @@ class DataBus:
     # Module health API (for watchdog/http_server)
     # ------------------------------------------------------------------
 
+    def register_module_health(self, module: str) -> Dict[str, Any]:
+        """
+        Create (or return) the health slot of a module. Called once when the
+        module is constructed; dict.setdefault() is atomic under the GIL.
+        A new slot bumps the health version, so it shows up in the snapshot
+        before the module's first update.
+        """
+        slot = self._module_health.get(module)
+        if slot is None:
+            slot = self._module_health.setdefault(module, {})
+            version = next(self._health_versions)
+            self._health_slot_versions[module] = version
+            self.health_version = version
+        return slot
+
     def update_module_health(self, module: str, **fields: Any) -> None:
         """
-        Update health information for a given module. Thread-safe.
+        Update health information for a given module. Lock-free.
+        Each module is the single writer of its own slot, so there is no
+        cross-module contention. Bumps the module's and the global health
+        version after the write, which marks the published snapshot as stale.
         """
-        with self._health_lock:
-            h = self._module_health.setdefault(module, {})
-            h.update(fields)
+        slot = self._module_health.get(module)
+        if slot is None:
+            slot = self.register_module_health(module)
+        slot.update(fields)
+        version = next(self._health_versions)
+        self._health_slot_versions[module] = version
+        self.health_version = version
 
     def get_module_health_snapshot(self) -> Dict[str, Dict[str, Any]]:
         """
-        Return a snapshot of current module health info. Thread-safe.
+        Return a snapshot of current module health info. Lock-free.
+
+        The snapshot is rebuilt only when health_version moved and published by
+        reference swap; otherwise the previously published snapshot is
+        returned as-is (callers can compare health_version or the object
+        identity to skip work). A rebuild copies only the slots updated since
+        the last one and reuses the other per-module dicts by reference. The
+        version is read before copying, so an update racing with the rebuild
+        just makes the next call rebuild again. Treat the result as read-only.
         """
-        with self._health_lock:
-            return {m: dict(info) for m, info in self._module_health.items()}
+        version = self.health_version
+        if version != self._health_published_version:
+            previous = self._health_published
+            published_versions = self._health_published_versions
+            slot_versions = dict(self._health_slot_versions)
+            # list() takes the items in one step, safe against concurrent registration
+            self._health_published = {
+                m: (previous[m] if m in previous and slot_versions.get(m) == published_versions.get(m) else dict(info))
+                for m, info in list(self._module_health.items())
+            }
+            self._health_published_versions = slot_versions
+            self._health_published_version = version
+        return self._health_published
 
     # ------------------------------------------------------------------
     # Snapshot for debugging / watchdog
@@ -388,38 +1307,38 @@ class DataBus:
         """
         Return a lightweight snapshot of core DataBus state, including queue sizes
         and key shared state items. Safe for monitoring.
+
+        Takes no registry lock: state values are copy-on-write references, and
+        module health comes from the published snapshot above.
         """
-        snapshot = {
-            "image_queue_size": self.image_queue.qsize(),
-            "detect_queue_size": self.detect_queue.qsize(),
+        registry = self._registry
+        config_dict = registry.get("config", {})
+        return {
+            # Relaxed sizes: no queue mutex is taken
+            "image_queue_size": self.queue_size(self.image_queue),
+            "detect_queue_size": self.queue_size(self.detect_queue),
             # [REMOVED] processed_image_queue_size removed
-            "error_log_size": self.error_log.qsize(),
-        }
-        
-        # Access unified registry for core state (config, motor, deter, image item)
-        with self._registry_lock:
-            # Use get_state to correctly retrieve copies of complex objects
-            snapshot["motor_location"] = self.get_state("motor_location", {})
-            snapshot["deter_flag"] = self.get_state("deter_flag", False)
-            snapshot["latest_processed_image_item_exists"] = self.get_state("latest_processed_image_item", None) is not None
-            snapshot["registry_keys"] = list(self._registry.keys())
-            
+            "error_log_size": self.queue_size(self.error_log),
+            "detection_log_size": len(self.detection_log),
+            "motor_location": registry.get("motor_location", {}),
+            "deter_flag": registry.get("deter_flag", False),
+            "latest_annotated_frame_exists": registry.get("latest_annotated_frame") is not None,
+            # list(dict) runs in C without releasing the GIL, so it cannot race an insert
+            "registry_keys": list(registry),
             # Include config key list for inspection
-            config_dict = self._registry.get("config", {})
-            snapshot["config_keys"] = list(config_dict.keys())
-
-        with self._health_lock:
-            snapshot["module_health"] = {
-                m: dict(info) for m, info in self._module_health.items()
-            }
-            
-        return snapshot
+            "config_keys": list(config_dict),
+            "module_health": self.get_module_health_snapshot(),
+        }
 
 
 __all__ = [
     "DataBus",
+    "RingBuffer",
+    "SpscRing",
+    "BoundedLatestDeque",
+    "FramePool",
+    "SharedJpegBuffer",
     "ImageItem",
-    "ProcessedImageItem",
     "DetectionItem",
     "ErrorEntry",
     "DEFAULT_CONFIG_STRUCTURE",
@@ -14,12 +14,18 @@ The module implements the following criteria:
 """
 
 import time
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Tuple
 import numpy as np
 
+# Optional JIT for the sliding-window kernel (pure-Python fallback if Numba is absent)
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
 # Assume these imports are available in the project structure
 from module_base import BaseModule
-from data_bus import DataBus, DetectionItem, ErrorEntry
+from data_bus import DataBus, DetectionItem
 
 # --- DEFAULT CONFIGURATION (Fallbacks only) ---
 DEFAULT_TIME_WINDOW_S = 2.0
@@ -29,6 +35,80 @@ DEFAULT_COOLDOWN_S = 15.0
 DEFAULT_RESET_DELAY_S = 2.0 
 DEFAULT_QUEUE_TIMEOUT = 0.05 # Increased default slightly for better CPU yielding
 DEFAULT_MAX_FAIL = 5
+DEFAULT_HISTORY_CAPACITY = 256 # frames kept in the window ring (rounded up to a power of two)
+
+# Minimum window size for reliable statistics (reduced slightly for faster debug response)
+MIN_WINDOW_FRAMES = 3
+
+# Bits of the DecisionLogicModule._check_all() criteria mask
+CRITERIA_TEMPORAL = 0b001
+CRITERIA_INTENSITY = 0b010
+CRITERIA_COOLDOWN = 0b100
+CRITERIA_ALL = CRITERIA_TEMPORAL | CRITERIA_INTENSITY | CRITERIA_COOLDOWN
+
+
+def _advance_head(
+    ts: np.ndarray,
+    det: np.ndarray,
+    ssum: np.ndarray,
+    head: int,
+    tail: int,
+    cutoff_ts: float,
+    min_head: int,
+) -> Tuple[int, int, float]:
+    """
+    Sliding-window expiry over the SoA history ring (power-of-two length).
+    Advances head past entries older than cutoff_ts (and at least up to
+    min_head, to make room for new entries).
+
+    Returns (new_head, expired detected frames, expired score sum).
+    Compiled with @njit(nogil=True, cache=True, fastmath=True) when Numba is
+    available, so it runs as native code without holding the GIL.
+    """
+    mask = ts.shape[0] - 1
+    removed_det = 0
+    removed_score = 0.0
+    while head < tail and (head < min_head or ts[head & mask] < cutoff_ts):
+        i = head & mask
+        if det[i]:
+            removed_det += 1
+            removed_score += float(ssum[i])
+        head += 1
+    return head, removed_det, removed_score
+
+
+def _advance_head_vectorized(
+    ts: np.ndarray,
+    det: np.ndarray,
+    ssum: np.ndarray,
+    head: int,
+    tail: int,
+    cutoff_ts: float,
+    min_head: int,
+) -> Tuple[int, int, float]:
+    """
+    Pure-NumPy equivalent of _advance_head, used when Numba is absent: live
+    timestamps are in capture order, so the expiry point is found with one
+    np.searchsorted (O(log N)) and the expired statistics are C-level sums,
+    instead of an interpreted per-entry loop.
+    """
+    n = tail - head
+    if n == 0:
+        return head, 0, 0.0
+    idx = (head + np.arange(n)) & (ts.shape[0] - 1)
+    k = int(np.searchsorted(ts[idx], cutoff_ts, side="left"))
+    k = max(k, min(min_head - head, n))
+    if k == 0:
+        return head, 0, 0.0
+    expired = idx[:k]
+    # Frames without detections have a zero score sum
+    return head + k, int(np.count_nonzero(det[expired])), float(ssum[expired].sum())
+
+
+if njit is not None:
+    _advance_head = njit(nogil=True, cache=True, fastmath=True)(_advance_head)
+else:
+    _advance_head = _advance_head_vectorized
 
 
 class DecisionLogicModule(BaseModule):
@@ -79,87 +159,129 @@ class DecisionLogicModule(BaseModule):
         self._last_deter_ts: float = 0.0
         # For Auto-Reset: Timestamp when deter_flag was last set to True
         self._deter_active_ts: float = 0.0 
-        # Buffer for historical analysis
-        self._history_buffer: List[DetectionItem] = []
+        # History window as a structure-of-arrays ring (power-of-two capacity,
+        # mask indexing): capture timestamp, has-detection flag and score sum per
+        # frame, computed once on ingest. Live entries are [head, tail).
+        capacity = max(32, int(get_cfg("history_capacity", DEFAULT_HISTORY_CAPACITY)))
+        capacity = 1 << (capacity - 1).bit_length()
+        self._ts: np.ndarray = np.zeros(capacity, dtype=np.float64)
+        self._det: np.ndarray = np.zeros(capacity, dtype=np.uint8)
+        self._ssum: np.ndarray = np.zeros(capacity, dtype=np.float64)
+        self._mask: int = capacity - 1
+        self._head: int = 0
+        self._tail: int = 0
+        # Running window statistics, updated on ingest/expiry
+        self._detected_count: int = 0
+        self._score_sum: float = 0.0
+        # Caller-owned drain buffer for detect_queue
+        self._drain_buf: List[DetectionItem] = []
 
     def setup(self) -> None:
         """Initialize module internal state before running the main loop."""
         print(f"[{self.name}] Setup: Decision Logic initialized. Window={self.time_window_s}s, Min Ratio={self.min_frame_ratio}, Reset Delay={self.reset_delay_s}s.")
         
         # Initialize timestamps if the flag is already active (e.g., after system reboot)
-        if self.data_bus.get_state("deter_flag", False):
-            self._last_deter_ts = time.time()
-            self._deter_active_ts = time.time()
+        if self.data_bus.get_deter_flag():
+            now = time.time()
+            self._last_deter_ts = now
+            self._deter_active_ts = now
 
     def teardown(self) -> None:
         """Clean up resources."""
         pass
 
-    def _update_history_buffer(self, new_items: List[DetectionItem]) -> None:
+    def _update_history_buffer(self, new_items: List[DetectionItem], now: float) -> None:
         """
         Adds new items to the buffer and prunes items older than the time window.
+        Item timestamps are camera capture times (stamped by the detector), so
+        the window measures when frames were seen, not when inference finished.
         """
         if new_items:
-            self._history_buffer.extend(new_items)
+            self._ingest(new_items)
         
-        cutoff_ts = time.time() - self.time_window_s
+        cutoff_ts = now - self.time_window_s
         
-        self._history_buffer = [
-            item for item in self._history_buffer 
-            if item.timestamp >= cutoff_ts
-        ]
+        # Items arrive in capture order, so only the oldest ones can expire:
+        # advance the ring head past them (amortized O(dropped)).
+        self._expire(cutoff_ts)
 
-    def _check_presence_criteria(self) -> bool:
+    def _expire(self, cutoff_ts: float, min_head: int = 0) -> None:
+        """Drop window entries older than cutoff_ts (or before min_head) and update the statistics."""
+        self._head, removed_det, removed_score = _advance_head(
+            self._ts, self._det, self._ssum,
+            self._head, self._tail, cutoff_ts, min_head,
+        )
+        self._detected_count -= removed_det
+        self._score_sum -= removed_score
+
+        if self._head == self._tail:
+            # Resynchronize: no float drift can survive an empty window
+            self._detected_count = 0
+            self._score_sum = 0.0
+
+    def _ingest(self, new_items: List[DetectionItem]) -> None:
         """
-        Checks both Temporal Consistency (frame ratio) and Detection Intensity (total score).
+        Append detections to the window and add them to the running statistics.
+
+        All scores of the batch are summed in one vectorized pass: the float32
+        score arrays are concatenated once and cumulatively summed, and each
+        frame's total is read off at its boundaries (frames without boxes get 0).
         """
-        if not self._history_buffer:
-            return False
+        n = len(new_items)
+        box_counts = np.fromiter((len(item.scores) for item in new_items), dtype=np.intp, count=n)
+        ends = np.cumsum(box_counts)
+        if ends[-1] > 0:
+            flat_scores = np.concatenate([item.scores for item in new_items])
+            csum = np.concatenate(([0.0], np.cumsum(flat_scores, dtype=np.float64)))
+            frame_scores = csum[ends] - csum[ends - box_counts]
+            batch_score = float(csum[-1])
+        else:
+            frame_scores = 0.0
+            batch_score = 0.0
+        det = np.fromiter((item.has_detection for item in new_items), dtype=np.uint8, count=n)
 
-        total_frames_in_window = len(self._history_buffer)
-        detected_frames_count = 0
-        total_confidence_score = 0.0
-        
-        # Safety check: if the window is too small for reliable statistics
-        if total_frames_in_window < 3: # Reduced slightly for faster debug response
-             return False
-
-        for item in self._history_buffer:
-            # Check if this frame has any detection
-            if item.boxes and len(item.boxes) > 0:
-                detected_frames_count += 1
-                
-                # Accumulate the scores for Intensity Check
-                if item.scores is not None and len(item.scores) > 0:
-                    try:
-                        scores_array = np.array(item.scores, dtype=float)
-                        total_confidence_score += np.sum(scores_array)
-                    except Exception:
-                        pass
+        # Ring full: evict the oldest entries to make room
+        min_head = self._tail + n - self._ts.shape[0]
+        if min_head > self._head:
+            self._expire(float("-inf"), min_head)
+
+        idx = (self._tail + np.arange(n)) & self._mask
+        self._ts[idx] = np.fromiter((item.timestamp for item in new_items), dtype=np.float64, count=n)
+        self._det[idx] = det
+        self._ssum[idx] = frame_scores
+        self._tail += n
+        self._detected_count += int(det.sum())
+        self._score_sum += batch_score
+
+    def _check_all(self, now: float) -> int:
+        """
+        Evaluates every trigger criterion at once and returns them as a bitmask:
+        CRITERIA_TEMPORAL (frame ratio, with at least MIN_WINDOW_FRAMES frames),
+        CRITERIA_INTENSITY (total score) and CRITERIA_COOLDOWN. Deterrence
+        triggers iff the mask equals CRITERIA_ALL: one comparison instead of a
+        short-circuit chain, and no branch on the (O(1)) running statistics.
+        """
+        total_frames_in_window = self._tail - self._head
         
-        # 1. Temporal Check: Did detected frames meet the minimum ratio?
-        current_ratio = detected_frames_count / total_frames_in_window
-        temporal_pass = (current_ratio >= self.min_frame_ratio)
+        # 1. Temporal Check: enough frames, and detected frames meet the minimum ratio
+        temporal_pass = (total_frames_in_window >= MIN_WINDOW_FRAMES) & (
+            self._detected_count / max(total_frames_in_window, 1) >= self.min_frame_ratio
+        )
         
         # 2. Intensity Check: Was the total confidence score high enough?
-        intensity_pass = (total_confidence_score >= self.min_total_score)
+        intensity_pass = self._score_sum >= self.min_total_score
 
-        return temporal_pass and intensity_pass
+        # 3. Cooldown Check: has the cooldown passed since the last trigger?
+        cooldown_pass = now - self._last_deter_ts >= self.cooldown_s
 
-    def _check_cooldown(self) -> bool:
-        """
-        Checks if the deterrence cooldown period has passed since the last trigger.
-        """
-        now = time.time()
-        elapsed = now - self._last_deter_ts
-        return elapsed >= self.cooldown_s
+        return temporal_pass | (intensity_pass << 1) | (cooldown_pass << 2)
 
     def step(self):
         """
         Main logic loop: 
         1. Auto-Reset Check.
-        2. Consume data.
-        3. [CRITICAL] Sleep if no data to avoid CPU spinning.
+        2. Consume data (blocks up to queue_timeout_s; wakes on the first detection).
+        3. Return if no data arrived.
         4. Update history and Logic check.
         """
         now = time.time()
@@ -167,68 +289,66 @@ class DecisionLogicModule(BaseModule):
         # -----------------------------------------------------------
         # 1. Auto-Reset Check (Time-based, must run regardless of new data)
         # -----------------------------------------------------------
-        is_flag_active = self.data_bus.get_state("deter_flag", False)
+        is_flag_active = self.data_bus.get_deter_flag()
         
         if is_flag_active and (now - self._deter_active_ts >= self.reset_delay_s):
             # Execute reset operation
-            self.data_bus.set_state("deter_flag", False)
+            self.data_bus.set_deter_flag(False)
             
             # Log the reset
             log_message = f"RESET: deter_flag automatically cleared after {self.reset_delay_s}s."
-            self.data_bus.queue_put(
-                self.data_bus.error_log,
-                ErrorEntry(now, self.name, "INFO", log_message),
-                drop_oldest_if_full=True
-            )
+            self.data_bus.push_error(self.name, "INFO", log_message, timestamp=now)
             is_flag_active = False 
 
         # -----------------------------------------------------------
         # 2. Consume the detect queue
         # -----------------------------------------------------------
-        new_items: List[DetectionItem] = self.data_bus.drain_queue(
+        # Blocking get on the ring's Condition: releases the GIL while idle (no
+        # CPU spinning) and wakes as soon as a detection is pushed, instead of
+        # a fixed sleep latency.
+        first: Optional[DetectionItem] = self.data_bus.queue_get(
             q=self.data_bus.detect_queue,
-            max_items=20 
+            timeout=self.queue_timeout_s,
         )
 
         # -----------------------------------------------------------
-        # 3. [CRITICAL FIX] CPU Yielding / Anti-Spinning
+        # 3. No new data: nothing to update (auto-reset already ran above)
         # -----------------------------------------------------------
-        # If there is no new data, the logic has nothing to update.
-        # We MUST sleep to release the GIL and let Yolo/Camera threads run.
-        if not new_items:
-            time.sleep(self.queue_timeout_s) 
+        if first is None:
             return
 
+        # Reused per step (cleared, never reallocated); _ingest copies what it keeps
+        new_items = self._drain_buf
+        new_items.clear()
+        new_items.append(first)
+        # Bulk drain: the rest of the backlog is taken under one queue lock
+        self.data_bus.drain_queue_into(self.data_bus.detect_queue, new_items, max_items=19)
+        now = time.time()
+
         # -----------------------------------------------------------
         # 4. Update Buffer & Check Logic (Only runs if new data arrived)
         # -----------------------------------------------------------
-        self._update_history_buffer(new_items)
+        # Clock re-read after the blocking wait (the one before it only serves the
+        # auto-reset check); this value is shared by all helpers below
+        self._update_history_buffer(new_items, now)
         
-        # Check for genuine target presence
-        is_target_present = self._check_presence_criteria()
-
-        if is_target_present:
-            # Check Cooldown
-            if self._check_cooldown():
-                # All triggering criteria met: Trigger deterrence
-                
-                # Get current stats for logging
-                total_frames = len(self._history_buffer)
-                detected_frames = sum(1 for item in self._history_buffer if item.boxes and len(item.boxes) > 0)
-                
-                log_message = (
-                    f"TRIGGERED: Temporal ({detected_frames}/{total_frames} frames, Ratio {self.min_frame_ratio}) "
-                    f"AND Intensity met. Cooldown passed."
-                )
-                self.data_bus.queue_put(
-                    self.data_bus.error_log,
-                    ErrorEntry(now, self.name, "INFO", log_message),
-                    drop_oldest_if_full=True
-                )
-                
-                # Set deter_flag to True
-                self.data_bus.set_state("deter_flag", True)
-                
-                # Record both timestamps
-                self._last_deter_ts = now
-                self._deter_active_ts = now
\ No newline at end of file
+        # Check for genuine target presence (temporal + intensity) and cooldown
+        if self._check_all(now) == CRITERIA_ALL:
+            # All triggering criteria met: Trigger deterrence
+            
+            # Get current stats for logging
+            total_frames = self._tail - self._head
+            detected_frames = self._detected_count
+            
+            log_message = (
+                f"TRIGGERED: Temporal ({detected_frames}/{total_frames} frames, Ratio {self.min_frame_ratio}) "
+                f"AND Intensity met. Cooldown passed."
+            )
+            self.data_bus.push_error(self.name, "INFO", log_message, timestamp=now)
+            
+            # Set deter_flag to True
+            self.data_bus.set_deter_flag(True)
+            
+            # Record both timestamps
+            self._last_deter_ts = now
+            self._deter_active_ts = now
\ No newline at end of file
@@ -6,20 +6,33 @@ Features:
 - Live Dashboard: Combines Video Stream + Real-time JSON Status.
 - Reads ALL configuration from DataBus.get_state("config").
 - Uses unified DataBus.get_state() for thread-safe access to shared state.
-- Reads latest image from DataBus registry ("latest_processed_image_item").
+- Reads latest image from DataBus registry ("latest_annotated_frame").
+- Serves JPEG bytes from the DataBus shared JPEG buffer when the detector
+  publishes there (no encoding, no lock on the request path).
 """
 
 from __future__ import annotations
 
+import hashlib
+import io
 import json
 import threading
 import time
-from typing import Any, Dict, Optional, Tuple, List
+import zlib
+from typing import Any, Dict, Mapping, NamedTuple, Optional, Tuple, List
 from datetime import datetime
+from email.utils import formatdate
 
 # Import Flask components
-from flask import Flask, Response, render_template_string
+from flask import Flask, Response, render_template_string, request
 from werkzeug.serving import make_server
+from werkzeug.wsgi import wrap_file
+
+# Optional: production WSGI server (thread pool, keep-alive); falls back to Werkzeug
+try:
+    from waitress import create_server as waitress_create_server
+except ImportError:
+    waitress_create_server = None  # type: ignore
 
 # Conditional imports for image processing
 try:
@@ -29,8 +42,20 @@ except ImportError:
     cv2 = None  # type: ignore
     np = None   # type: ignore
 
+# Optional: libjpeg-turbo encoder, called directly (falls back to cv2.imencode)
+try:
+    import simplejpeg
+except ImportError:
+    simplejpeg = None  # type: ignore
+
+# Optional: Rust-native JSON encoder for /status (falls back to stdlib json)
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore
+
 # Import necessary components from the common modules
-from data_bus import DataBus, ProcessedImageItem, DEFAULT_CONFIG_STRUCTURE
+from data_bus import DataBus, DetectionItem, DEFAULT_CONFIG_STRUCTURE
 from module_base import BaseModule
 
 
@@ -38,16 +63,250 @@ from module_base import BaseModule
 # Helpers for JSON Serialization
 # ---------------------------------------------------------------------------
 
+# numpy arrays/scalars and dataclasses are encoded natively by orjson;
+# NON_STR_KEYS matches json.dumps, which accepts int/float dict keys.
+ORJSON_OPTIONS = (
+    orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_SERIALIZE_DATACLASS
+    | orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS
+) if orjson is not None else 0
+
+
+# /status bodies at least this large are gzip-compressed for clients that accept it
+GZIP_MIN_BYTES = 1024
+
+
+class StatusSnapshot(NamedTuple):
+    """One published /status state (swapped in as a whole by _update_snapshot)."""
+    data: Dict[str, Any]
+    json: bytes                  # encoded data
+    json_head: bytes             # json minus its closing brace, plus "," unless empty
+    etag: str                    # weak ETag of json
+    gzip_head: Optional[bytes]   # gzip stream of json_head (sync-flushed)
+    gzip_state: Any              # zlib compressor positioned after gzip_head (copied per request)
+
+
+def accepts_gzip(accept_encoding: str) -> bool:
+    """True if an Accept-Encoding header value allows gzip (not listed with q=0)."""
+    for coding in accept_encoding.split(","):
+        name, _, params = coding.partition(";")
+        if name.strip().lower() in ("gzip", "*"):
+            q = 1.0
+            for param in params.split(";"):
+                key, _, value = param.strip().partition("=")
+                if key == "q":
+                    try:
+                        q = float(value)
+                    except ValueError:
+                        q = 0.0
+            return q > 0
+    return False
+
+
+# Constant header/trailer of every part of the /stream multipart response
+MJPEG_PART_HEADER = b'--frame\r\nContent-Type: image/jpeg\r\n\r\n'
+MJPEG_PART_END = b'\r\n'
+
+
 def json_default(value: Any) -> Any:
     """Helper to serialize complex types (like numpy arrays) into JSON."""
-    if isinstance(value, np.ndarray):
+    if np is not None and isinstance(value, np.ndarray):
+        # Only reached with the stdlib json fallback (orjson encodes ndarrays natively)
         return value.tolist()
+    if isinstance(value, Mapping):
+        # e.g. the read-only MappingProxyType meta shared by DataBus items
+        return dict(value)
     if isinstance(value, datetime):
         return value.isoformat()
     if isinstance(value, bytes):
         return value.decode('utf-8', errors='ignore')
     return repr(value)
 
+# Dashboard page: static, so it is encoded once at import time and served as-is
+DASHBOARD_HTML: bytes = """
+<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>DRID System Dashboard</title>
+    <style>
+        body {
+            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
+            background-color: #f4f4f9;
+            color: #333;
+            margin: 0;
+            padding: 20px;
+            transition: background-color 0.5s ease;
+        }
+        h1 { margin-bottom: 20px; }
+        
+        .dashboard-container {
+            display: flex;
+            flex-wrap: wrap;
+            gap: 20px;
+            align-items: flex-start;
+        }
+        
+        /* Video Section */
+        .video-card {
+            background: white;
+            padding: 10px;
+            border-radius: 8px;
+            box-shadow: 0 2px 5px rgba(0,0,0,0.1);
+            flex: 1 1 640px; /* Grow/Shrink with base width 640 */
+            max-width: 100%;
+        }
+        .video-card img {
+            width: 100%;
+            height: auto;
+            border-radius: 4px;
+            display: block;
+        }
+
+        /* Status Section */
+        .status-card {
+            background: white;
+            padding: 20px;
+            border-radius: 8px;
+            box-shadow: 0 2px 5px rgba(0,0,0,0.1);
+            flex: 1 1 400px;
+            max-height: 80vh;
+            overflow-y: auto;
+        }
+        pre {
+            background: #2d2d2d;
+            color: #76e068;
+            padding: 15px;
+            border-radius: 5px;
+            font-size: 13px;
+            overflow-x: auto;
+            white-space: pre-wrap; /* Wrap long lines */
+        }
+
+        /* Dynamic State Classes */
+        .state-deterrence {
+            background-color: #ff0000 !important; 
+            color: white !important;              
+            transition: background-color 0.1s;
+        }
+    </style>
+</head>
+<body id="body-el">
+    <h1>DRID System Dashboard</h1>
+    
+    <div class="dashboard-container">
+        <div class="video-card">
+            <h3>Live Camera Stream</h3>
+            <img src="/stream" alt="Waiting for stream...">
+        </div>
+
+        <div class="status-card">
+            <h3>System Telemetry (Live)</h3>
+            <div id="connection-status" style="font-size: 0.8em; color: gray; margin-bottom: 5px;">Connecting...</div>
+            <pre id="json-display">Loading data...</pre>
+        </div>
+    </div>
+
+    <script>
+        const statusUrl = "/status";
+        const jsonDisplay = document.getElementById('json-display');
+        const bodyEl = document.getElementById('body-el');
+        const connStatus = document.getElementById('connection-status');
+        
+        // Function to update the dashboard
+        async function updateDashboard() {
+            try {
+                const response = await fetch(statusUrl);
+                if (!response.ok) throw new Error('Network response was not ok');
+                
+                const data = await response.json();
+                
+                // 1. Update JSON Text
+                jsonDisplay.textContent = JSON.stringify(data, null, 2);
+                
+                // 2. Visual Warning if Deterrence is active
+                // Checks if 'deter_flag' exists and is true
+                if (data.deter_flag === true) {
+                    bodyEl.classList.add('state-deterrence');
+                } else {
+                    bodyEl.classList.remove('state-deterrence');
+                }
+
+                connStatus.textContent = "Last Updated: " + new Date().toLocaleTimeString();
+                connStatus.style.color = "green";
+
+            } catch (error) {
+                console.error('Fetch error:', error);
+                connStatus.textContent = "Connection Lost. Retrying...";
+                connStatus.style.color = "red";
+            }
+        }
+
+        // Update every 500ms (2 FPS for data)
+        setInterval(updateDashboard, 500);
+        
+        // Initial call
+        updateDashboard();
+    </script>
+</body>
+</html>
+""".encode("utf-8")
+
+# Validators for the static page: browsers revalidate with If-None-Match /
+# If-Modified-Since and get a body-less 304 (Last-Modified = server start)
+DASHBOARD_HEADERS: Dict[str, str] = {
+    "Cache-Control": "public, max-age=3600",
+    "ETag": '"%s"' % hashlib.blake2b(DASHBOARD_HTML, digest_size=8).hexdigest(),
+    "Last-Modified": formatdate(usegmt=True),
+}
+DASHBOARD_WSGI_HEADERS: List[Tuple[str, str]] = [
+    ("Content-Type", "text/html; charset=utf-8"),
+    ("Content-Length", str(len(DASHBOARD_HTML))),
+    *DASHBOARD_HEADERS.items(),
+]
+
+
+class FastPathWSGI:
+    """
+    WSGI wrapper around the Flask app for the two hot, cache-backed endpoints:
+    GET /status and GET / are answered straight from precomputed bytes with a
+    dict lookup on PATH_INFO, skipping Flask's routing and request context.
+    Every other request (and a conditional / with If-Modified-Since) goes to
+    the Flask app unchanged.
+    """
+
+    def __init__(self, app: Any, module: "HttpServerModule") -> None:
+        self.app = app
+        self.module = module
+        self._routes = {"/status": self._status, "/": self._home}
+
+    def __call__(self, environ: Dict[str, Any], start_response: Any) -> Any:
+        if environ.get("REQUEST_METHOD") == "GET":
+            handler = self._routes.get(environ.get("PATH_INFO", ""))
+            if handler is not None:
+                body = handler(environ, start_response)
+                if body is not None:
+                    return body
+        return self.app(environ, start_response)
+
+    def _status(self, environ: Dict[str, Any], start_response: Any) -> List[bytes]:
+        status, headers, body = self.module.status_response(
+            environ.get("HTTP_IF_NONE_MATCH", ""), environ.get("HTTP_ACCEPT_ENCODING", "")
+        )
+        start_response(status, headers)
+        return [body]
+
+    def _home(self, environ: Dict[str, Any], start_response: Any) -> Optional[List[bytes]]:
+        if_none_match = environ.get("HTTP_IF_NONE_MATCH", "")
+        if if_none_match and DASHBOARD_HEADERS["ETag"] in if_none_match:
+            start_response("304 Not Modified", list(DASHBOARD_HEADERS.items()))
+            return [b""]
+        if "HTTP_IF_MODIFIED_SINCE" in environ:
+            return None # date comparison: left to Flask's make_conditional
+        start_response("200 OK", DASHBOARD_WSGI_HEADERS)
+        return [DASHBOARD_HTML]
+
+
 # ---------------------------------------------------------------------------
 # HTTP Server Module
 # ---------------------------------------------------------------------------
@@ -100,24 +359,43 @@ class HttpServerModule(BaseModule):
         self.port: int = int(get_cfg("port", 5000))
         self.poll_interval: float = float(get_cfg("poll_interval", 1.0))
         self.export_keys: List[str] = get_cfg("export_config_keys", ["motor_location", "deter_flag"])
+        self._export_keys: Tuple[str, ...] = tuple(self.export_keys) # frozen copy iterated per poll
+        self._state_keys: Tuple[str, ...] = self._export_keys + ("latest_annotated_frame",) # read per poll
+        self._last_state_version: Optional[int] = None # DataBus.state_version behind _snapshot
+        self.jpeg_quality: int = int(get_cfg("jpeg_quality", 90))
+        self._jpeg_params: List[int] = [int(cv2.IMWRITE_JPEG_QUALITY), self.jpeg_quality] if cv2 is not None else []
+        self.stream_max_width: Optional[int] = get_cfg("stream_max_width", 640) # None = full resolution
+        self._resize_buf: Optional[np.ndarray] = None # reused by the encoder thread's downscale
+        self.server_threads: int = max(1, int(get_cfg("threads", 8))) # waitress worker threads
 
         # --- Internal Runtime State ---
         self.app = Flask(__name__)
-        self._server: Optional[make_server] = None
+        self._server: Optional[Any] = None
         self._server_thread: Optional[threading.Thread] = None
 
-        self._snapshot: Dict[str, Any] = {}
-        self._snapshot_lock = threading.Lock()
-        
-        self._latest_image_jpeg: Optional[bytes] = None
-        self._latest_image_meta: Dict[str, Any] = {}
-        self._image_lock = threading.Lock()
+        # Published RCU-style: built off to the side, then swapped in with a single
+        # attribute store (atomic under the GIL). Readers take no lock and must
+        # treat what they get as read-only.
+        self._snapshot: StatusSnapshot = self._build_status_snapshot({})
+        self._latest_image_meta: Dict[str, Any] = {} # written by the step thread
+        self._last_image_ts: Optional[float] = None # timestamp of the frame behind _latest_image_meta
+        self._latest_jpeg: Optional[bytes] = None # written by the encoder thread (fallback JPEG)
+
+        # Fallback JPEG encoding runs on its own thread, so /status updates never
+        # wait for it; _update_snapshot only signals new frames.
+        self._encode_evt = threading.Event()
+        self._encoder_thread: Optional[threading.Thread] = None
+        # Own notification Event: set on the deter_flag False -> True edge (so
+        # /status refreshes right away) and by stop() to cut the poll wait short
+        self._wake = data_bus.register_state_waiter("http")
 
         # Bind Flask routes
         self.app.add_url_rule("/status", view_func=self._handle_status, methods=["GET"])
         self.app.add_url_rule("/image", view_func=self._handle_image, methods=["GET"])
         self.app.add_url_rule("/stream", view_func=self._handle_stream, methods=["GET"])
         self.app.add_url_rule("/", view_func=self._handle_home, methods=["GET"])
+        # What the server runs: hot cached endpoints bypass Flask, the rest is self.app
+        self.wsgi_app = FastPathWSGI(self.app, self)
 
     # ------------------------------------------------------------------ #
     # Lifecycle
@@ -126,23 +404,49 @@ class HttpServerModule(BaseModule):
     def setup(self) -> None:
         """Initialize and start the WSGI server."""
         print(f"[{self.name}] Setup: Starting HTTP server on http://{self.host}:{self.port}...")
-        self._server = make_server(self.host, self.port, self.app, threaded=True)
-        self._server_thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        if waitress_create_server is not None:
+            self._server = waitress_create_server(self.wsgi_app, host=self.host, port=self.port, threads=self.server_threads)
+            serve = self._server.run
+        else:
+            self._server = make_server(self.host, self.port, self.wsgi_app, threaded=True)
+            serve = self._server.serve_forever
+        self._server_thread = threading.Thread(target=serve, daemon=True)
         self._server_thread.start()
+        if cv2 is not None:
+            self._encoder_thread = threading.Thread(target=self._encoder_loop, name=f"{self.name}.encoder", daemon=True)
+            self._encoder_thread.start()
         self._update_snapshot()
 
     def step(self) -> None:
         """Update snapshot and wait for events."""
+        t0 = time.time()
         self._update_snapshot()
-        # Wait efficiently for state changes or timeout
-        self.data_bus.wait_for_state_change(timeout=self.poll_interval)
+        if self.should_stop():
+            return
+        # Sleep for the rest of the poll interval (fixed cadence); a deter_flag
+        # rise or stop() wakes it early
+        remaining = self.poll_interval - (time.time() - t0)
+        if remaining > 0 and self._wake.wait(timeout=remaining):
+            self._wake.clear()
+
+    def stop(self) -> None:
+        """Request stop and interrupt the wait in step() right away."""
+        super().stop()
+        self._wake.set()
+        self._encode_evt.set()
         
     def teardown(self) -> None:
         """Stop the server."""
         if self._server:
-            self._server.shutdown()
+            if waitress_create_server is not None:
+                self._server.close()
+            else:
+                self._server.shutdown()
         if self._server_thread and self._server_thread.is_alive():
             self._server_thread.join(timeout=2)
+        if self._encoder_thread and self._encoder_thread.is_alive():
+            self._encode_evt.set()
+            self._encoder_thread.join(timeout=2)
 
     # ------------------------------------------------------------------ #
     # Data Logic
@@ -150,87 +454,251 @@ class HttpServerModule(BaseModule):
 
     def _update_snapshot(self) -> None:
         """Update the internal state snapshot from DataBus."""
-        new_snapshot: Dict[str, Any] = {}
+        data_bus = self.data_bus
+
+        # Read the version before the state: a write racing with this poll
+        # only causes one extra rebuild on the next poll.
+        state_version = data_bus.state_version
+        # Same object while DataBus.health_version is unchanged: reused by reference
+        health = data_bus.get_module_health_snapshot()
+        if state_version == self._last_state_version and health is self._snapshot.data.get("health"):
+            return # nothing changed: keep the published snapshot
+        self._last_state_version = state_version
         
-        # 1. Health & Configured Keys
-        new_snapshot["health"] = self.data_bus.get_module_health_snapshot()
-        for key in self.export_keys:
-            new_snapshot[key] = self.data_bus.get_state(key)
+        # 1. Health & Configured Keys (all keys read in one call)
+        states = data_bus.get_states(self._state_keys)
+        new_snapshot: Dict[str, Any] = {"health": health}
+        for key in self._export_keys:
+            new_snapshot[key] = states[key]
 
         # 2. Latest Image Logic
-        latest_item: Optional[ProcessedImageItem] = self.data_bus.get_state("latest_processed_image_item", None)
-        
-        if latest_item and cv2 is not None:
-            jpeg_bytes = self._generate_jpeg(latest_item.frame)
-            image_meta = {
-                "timestamp": latest_item.timestamp,
-                "width": latest_item.frame.shape[1],
-                "height": latest_item.frame.shape[0],
-                "detection_count": len(latest_item.boxes),
-                "meta": latest_item.meta,
-            }
-            if jpeg_bytes:
-                with self._image_lock:
-                    self._latest_image_jpeg = jpeg_bytes
-                    self._latest_image_meta = image_meta
-            new_snapshot["latest_processed_image"] = image_meta
+        latest: Optional[Tuple[Any, DetectionItem]] = states["latest_annotated_frame"]
+        if latest and cv2 is not None:
+            new_snapshot["latest_processed_image"] = self._read_latest_image(*latest)
         else:
-            with self._image_lock:
-                 new_snapshot["latest_processed_image"] = self._latest_image_meta if self._latest_image_meta else {"status": "No data"}
-
-        with self._snapshot_lock:
-            self._snapshot = new_snapshot
+            latest_meta = self._latest_image_meta
+            new_snapshot["latest_processed_image"] = latest_meta if latest_meta else {"status": "No data"}
+
+        # Encoded once per update and published together with the snapshot, so
+        # every /status request until the next update shares the same bytes.
+        self._snapshot = self._build_status_snapshot(new_snapshot, self._snapshot)
+
+    def _read_latest_image(self, frame: np.ndarray, det_item: DetectionItem) -> Dict[str, Any]:
+        """Publish the latest annotated frame's metadata (and request its fallback JPEG)."""
+        if det_item.timestamp == self._last_image_ts:
+            # Same frame as the previous poll: reuse its metadata (already encoded)
+            return self._latest_image_meta
+
+        # The detector already exports encoded frames: only encode as a fallback.
+        if self.data_bus.jpeg_buffer.sequence == 0:
+            self._encode_evt.set()
+        image_meta = {
+            "timestamp": det_item.timestamp,
+            "width": frame.shape[1],
+            "height": frame.shape[0],
+            "detection_count": len(det_item.boxes),
+            "meta": det_item.meta,
+        }
+        self._latest_image_meta = image_meta
+        self._last_image_ts = det_item.timestamp
+        return image_meta
+
+    def _encoder_loop(self) -> None:
+        """
+        Fallback JPEG encoder thread: on each signal, encode the newest annotated
+        frame (frames published in between are skipped, never queued) and
+        publish it to _latest_jpeg by a single reference store.
+        """
+        encoded_ts: Optional[float] = None
+        while not self.should_stop():
+            self._encode_evt.wait(timeout=self.poll_interval)
+            self._encode_evt.clear()
+            if self.data_bus.jpeg_buffer.sequence > 0:
+                continue # the detector exports JPEGs: nothing to do
+            latest: Optional[Tuple[Any, DetectionItem]] = self.data_bus.get_state("latest_annotated_frame", None)
+            if not latest or latest[1].timestamp == encoded_ts:
+                continue
+            frame, det_item = latest
+            jpeg_bytes = self._generate_jpeg(self._fit_width(frame, self.stream_max_width))
+            if jpeg_bytes:
+                self._latest_jpeg = jpeg_bytes
+            encoded_ts = det_item.timestamp
+
+    def _build_status_snapshot(self, data: Dict[str, Any], previous: Optional[StatusSnapshot] = None) -> StatusSnapshot:
+        """Encode data once, with its ETag and precompressed gzip form."""
+        body = self._encode_json(data)
+        if previous is not None and previous.json == body:
+            # Unchanged content: keep the ETag (clients get 304) and the compressed form
+            return previous._replace(data=data)
+
+        # Open object, ready for the per-request server_timestamp (see _handle_status)
+        assert body[-1:] == b"}", "snapshot must encode to a JSON object"
+        json_head = body[:-1] + b"," if len(body) > 2 else body[:-1]
+
+        etag = hashlib.blake2b(body, digest_size=8).hexdigest()
+        gzip_head = gzip_state = None
+        if len(body) >= GZIP_MIN_BYTES:
+            # Compress the open object and sync-flush, so each request only has
+            # to compress its server_timestamp.
+            gzip_state = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+            gzip_head = gzip_state.compress(json_head) + gzip_state.flush(zlib.Z_SYNC_FLUSH)
+        return StatusSnapshot(data, body, json_head, etag, gzip_head, gzip_state)
 
     def get_snapshot(self) -> Dict[str, Any]:
-        with self._snapshot_lock:
-            return dict(self._snapshot)
+        """Latest snapshot (lock-free, shared: do not modify)."""
+        return self._snapshot.data
+
+    def get_snapshot_json(self) -> bytes:
+        """Latest snapshot, JSON-encoded (lock-free)."""
+        return self._snapshot.json
+
+    def get_latest_image_jpeg(self) -> Optional[bytes]:
+        """Latest JPEG: shared buffer first (lock-free), local encode as fallback."""
+        _, jpeg_bytes = self.data_bus.read_jpeg()
+        if jpeg_bytes is not None:
+            return jpeg_bytes
+        return self._latest_jpeg
+
+    def _generate_full_jpeg(self) -> Optional[bytes]:
+        """Encode the latest annotated frame at full resolution, or None."""
+        latest: Optional[Tuple[Any, DetectionItem]] = self.data_bus.get_state("latest_annotated_frame", None)
+        if not latest or cv2 is None:
+            return None
+        return self._generate_jpeg(latest[0])
 
     def get_latest_image_data(self) -> Tuple[Optional[bytes], Dict[str, Any]]:
-        with self._image_lock:
-            return self._latest_image_jpeg, dict(self._latest_image_meta)
+        """Latest (JPEG, meta) pair (lock-free, shared: do not modify)."""
+        return self.get_latest_image_jpeg(), self._latest_image_meta
 
     # ------------------------------------------------------------------ #
     # Utilities
     # ------------------------------------------------------------------ #
 
+    def _encode_json(self, payload: Dict[str, Any]) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(payload, default=json_default, option=ORJSON_OPTIONS)
+        return json.dumps(payload, default=json_default).encode("utf-8")
+
     def _json_response(self, payload: Dict[str, Any], status: int = 200) -> Response:
-        body = json.dumps(payload, default=json_default)
-        return Response(body, status=status, mimetype="application/json")
+        # bytes, handed to the Response as-is
+        return Response(self._encode_json(payload), status=status, mimetype="application/json")
         
+    def _fit_width(self, frame: np.ndarray, max_width: Optional[int]) -> np.ndarray:
+        """
+        Downscale frame (INTER_AREA) to at most max_width pixels wide, keeping
+        the aspect ratio; encode cost scales with the pixel count. The result
+        is written into a reused buffer: encoder thread only.
+        """
+        height, width = frame.shape[:2]
+        if not max_width or width <= max_width:
+            return frame
+        size = (int(max_width), max(1, round(height * max_width / width)))
+        shape = (size[1], size[0]) + frame.shape[2:]
+        if self._resize_buf is None or self._resize_buf.shape != shape or self._resize_buf.dtype != frame.dtype:
+            self._resize_buf = np.empty(shape, dtype=frame.dtype)
+        return cv2.resize(frame, size, dst=self._resize_buf, interpolation=cv2.INTER_AREA)
+
     def _generate_jpeg(self, frame: np.ndarray) -> Optional[bytes]:
+        # Assuming frame is BGR. Only the encoder call itself is guarded.
+        if simplejpeg is not None and frame.ndim == 3 and frame.shape[2] == 3:
+            try:
+                return simplejpeg.encode_jpeg(
+                    np.ascontiguousarray(frame), quality=self.jpeg_quality, colorspace='BGR', fastdct=True
+                )
+            except Exception as e:
+                print(f"[{self.name}] JPEG Error: {e}")
+                return None
         if cv2 is None: return None
-        # Assuming frame is BGR
-        encode_param = [int(cv2.IMWRITE_JPEG_QUALITY), 90]
         try:
-            _, jpeg_buffer = cv2.imencode('.jpg', frame, encode_param)
-            return jpeg_buffer.tobytes()
+            ok, jpeg_buffer = cv2.imencode('.jpg', frame, self._jpeg_params)
         except Exception as e:
             print(f"[{self.name}] JPEG Error: {e}")
             return None
+        return jpeg_buffer.tobytes() if ok else None
 
     # ------------------------------------------------------------------ #
     # Routes
     # ------------------------------------------------------------------ #
 
+    def status_response(self, if_none_match: str, accept_encoding: str) -> Tuple[str, List[Tuple[str, str]], bytes]:
+        """
+        Framework-free /status: (status line, headers, body) from the cached
+        snapshot, given the raw If-None-Match / Accept-Encoding header values.
+        Shared by the Flask route and the FastPathWSGI wrapper.
+        """
+        snap = self._snapshot
+        etag = 'W/"%s"' % snap.etag
+        # Nothing changed since the client's copy: no body at all
+        if if_none_match and (f'"{snap.etag}"' in if_none_match or if_none_match.strip() == "*"):
+            return "304 Not Modified", [("ETag", etag), ("Vary", "Accept-Encoding")], b""
+
+        # Close the cached open object with the live server_timestamp:
+        # "{...," -> "{...,"server_timestamp":t}" (one small bytes format per request)
+        now = time.time()
+        headers = [("Content-Type", "application/json"), ("ETag", etag), ("Vary", "Accept-Encoding")]
+        if snap.gzip_head is not None and accepts_gzip(accept_encoding):
+            compressor = snap.gzip_state.copy()
+            tail = compressor.compress(b"\"server_timestamp\":%r}" % now) + compressor.flush()
+            body = snap.gzip_head + tail
+            headers.append(("Content-Encoding", "gzip"))
+        else:
+            body = b"%s\"server_timestamp\":%r}" % (snap.json_head, now)
+        headers.append(("Content-Length", str(len(body))))
+        return "200 OK", headers, body
+
     def _handle_status(self) -> Response:
-        snapshot = self.get_snapshot()
-        snapshot["server_timestamp"] = time.time()
-        return self._json_response(snapshot)
+        status, headers, body = self.status_response(
+            request.headers.get("If-None-Match", ""), request.headers.get("Accept-Encoding", "")
+        )
+        return Response(body, status=status, headers=headers)
 
     def _handle_image(self) -> Response:
-        jpeg_bytes, _ = self.get_latest_image_data()
+        if request.args.get("full") == "1":
+            # Full-resolution still, encoded on demand (the published JPEG is stream-sized)
+            jpeg_bytes = self._generate_full_jpeg()
+        else:
+            jpeg_bytes = self.get_latest_image_jpeg()
         if jpeg_bytes is None:
             return self._json_response({"error": "No image data"}, status=503)
-        return Response(jpeg_bytes, status=200, mimetype="image/jpeg")
+        # Hand the bytes to the WSGI server as a file (BytesIO shares the buffer,
+        # no copy), so servers with wsgi.file_wrapper can send it directly; the
+        # explicit Content-Length keeps the connection alive without chunking.
+        return Response(
+            wrap_file(request.environ, io.BytesIO(jpeg_bytes)),
+            status=200,
+            mimetype="image/jpeg",
+            direct_passthrough=True,
+            headers={"Content-Length": str(len(jpeg_bytes)), "Cache-Control": "no-store"},
+        )
 
     def _handle_stream(self) -> Response:
+        """
+        MJPEG stream that only ever sends the newest frame: after each (possibly
+        slow, client-paced) yield it jumps to the latest published JPEG, so
+        frames published meanwhile are dropped instead of queued, and no frame
+        is sent twice.
+        """
         def generate():
+            last_seq = 0
+            last_local: Optional[bytes] = None
             while not self.should_stop():
-                jpeg_bytes, _ = self.get_latest_image_data()
+                # Sleep until the detector publishes a new frame (no polling, no duplicates)
+                seq = self.data_bus.wait_for_jpeg(last_seq, timeout=self.poll_interval)
+                if seq != last_seq:
+                    # Track the sequence of the bytes actually read (it may be newer than seq)
+                    last_seq, jpeg_bytes = self.data_bus.read_jpeg()
+                else:
+                    # Nothing new in the shared buffer: local encode fallback, if it changed
+                    jpeg_bytes = self._latest_jpeg
+                    if jpeg_bytes is last_local:
+                        continue
+                    last_local = jpeg_bytes
                 if jpeg_bytes:
-                    yield (b'--frame\r\n'
-                           b'Content-Type: image/jpeg\r\n\r\n' + jpeg_bytes + b'\r\n')
-                time.sleep(0.05) # ~20 FPS cap
+                    # Three chunks instead of one concatenation: no per-frame copy of
+                    # the JPEG (bytes, not memoryview: Werkzeug's server requires bytes)
+                    yield MJPEG_PART_HEADER
+                    yield jpeg_bytes
+                    yield MJPEG_PART_END
         return Response(generate(), mimetype='multipart/x-mixed-replace; boundary=frame')
     
     def _handle_home(self) -> Response:
@@ -239,133 +707,6 @@ class HttpServerModule(BaseModule):
         - Displays /stream (Video)
         - Displays /status (JSON) updated via JavaScript
         """
-        html = f"""
-        <!DOCTYPE html>
-        <html lang="en">
-        <head>
-            <meta charset="UTF-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <title>DRID System Dashboard</title>
-            <style>
-                body {{
-                    font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-                    background-color: #f4f4f9;
-                    color: #333;
-                    margin: 0;
-                    padding: 20px;
-                    transition: background-color 0.5s ease;
-                }}
-                h1 {{ margin-bottom: 20px; }}
-                
-                .dashboard-container {{
-                    display: flex;
-                    flex-wrap: wrap;
-                    gap: 20px;
-                    align-items: flex-start;
-                }}
-                
-                /* Video Section */
-                .video-card {{
-                    background: white;
-                    padding: 10px;
-                    border-radius: 8px;
-                    box-shadow: 0 2px 5px rgba(0,0,0,0.1);
-                    flex: 1 1 640px; /* Grow/Shrink with base width 640 */
-                    max-width: 100%;
-                }}
-                .video-card img {{
-                    width: 100%;
-                    height: auto;
-                    border-radius: 4px;
-                    display: block;
-                }}
-
-                /* Status Section */
-                .status-card {{
-                    background: white;
-                    padding: 20px;
-                    border-radius: 8px;
-                    box-shadow: 0 2px 5px rgba(0,0,0,0.1);
-                    flex: 1 1 400px;
-                    max-height: 80vh;
-                    overflow-y: auto;
-                }}
-                pre {{
-                    background: #2d2d2d;
-                    color: #76e068;
-                    padding: 15px;
-                    border-radius: 5px;
-                    font-size: 13px;
-                    overflow-x: auto;
-                    white-space: pre-wrap; /* Wrap long lines */
-                }}
-
-                /* Dynamic State Classes */
-                .state-deterrence {{
-                    background-color: #ff0000 !important; 
-                    color: white !important;              
-                    transition: background-color 0.1s;
-                }}
-            </style>
-        </head>
-        <body id="body-el">
-            <h1>DRID System Dashboard</h1>
-            
-            <div class="dashboard-container">
-                <div class="video-card">
-                    <h3>Live Camera Stream</h3>
-                    <img src="/stream" alt="Waiting for stream...">
-                </div>
-
-                <div class="status-card">
-                    <h3>System Telemetry (Live)</h3>
-                    <div id="connection-status" style="font-size: 0.8em; color: gray; margin-bottom: 5px;">Connecting...</div>
-                    <pre id="json-display">Loading data...</pre>
-                </div>
-            </div>
-
-            <script>
-                const statusUrl = "/status";
-                const jsonDisplay = document.getElementById('json-display');
-                const bodyEl = document.getElementById('body-el');
-                const connStatus = document.getElementById('connection-status');
-                
-                // Function to update the dashboard
-                async function updateDashboard() {{
-                    try {{
-                        const response = await fetch(statusUrl);
-                        if (!response.ok) throw new Error('Network response was not ok');
-                        
-                        const data = await response.json();
-                        
-                        // 1. Update JSON Text
-                        jsonDisplay.textContent = JSON.stringify(data, null, 2);
-                        
-                        // 2. Visual Warning if Deterrence is active
-                        // Checks if 'deter_flag' exists and is true
-                        if (data.deter_flag === true) {{
-                            bodyEl.classList.add('state-deterrence');
-                        }} else {{
-                            bodyEl.classList.remove('state-deterrence');
-                        }}
-
-                        connStatus.textContent = "Last Updated: " + new Date().toLocaleTimeString();
-                        connStatus.style.color = "green";
-
-                    }} catch (error) {{
-                        console.error('Fetch error:', error);
-                        connStatus.textContent = "Connection Lost. Retrying...";
-                        connStatus.style.color = "red";
-                    }}
-                }}
-
-                // Update every 500ms (2 FPS for data)
-                setInterval(updateDashboard, 500);
-                
-                // Initial call
-                updateDashboard();
-            </script>
-        </body>
-        </html>
-        """
-        return Response(html, mimetype='text/html')
\ No newline at end of file
+        response = Response(DASHBOARD_HTML, mimetype='text/html', headers=DASHBOARD_HEADERS)
+        # 304 without a body when the browser's copy is still current
+        return response.make_conditional(request)
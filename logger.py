@@ -6,32 +6,78 @@ processed image upon deterrence flag activation (deter_flag=True).
 
 - Listens for the 'deter_flag' state change.
 - [MODIFIED] Reads latest image directly from the DataBus registry 
-  ("latest_processed_image_item"), eliminating the need for queue competition 
+  ("latest_annotated_frame"), eliminating the need for queue competition 
   and unreliable time delays.
 - Logs key state (motor_location) immediately.
 - Archives the latest processed image to a file.
+- Drains DataBus.error_log (and detection_log events) in batches into an error log file.
 """
 
 import time
 import os
 import json
-from datetime import datetime
-from typing import Any, Dict, List, Optional
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, BinaryIO, Deque, Dict, List, Optional, Tuple
+
+try:
+    import cv2  # For archiving snapshots
+except ImportError:
+    cv2 = None
 
 # Assume these imports are available in the project structure
 from module_base import BaseModule
-from data_bus import DataBus, ProcessedImageItem, ErrorEntry
+from data_bus import DataBus, DetectionItem, ErrorEntry
 # Reusing the json_default helper from http_server for complex object serialization
 # NOTE: json_default is assumed to be imported from http_server, or defined/imported elsewhere.
 from http_server import json_default 
 
 # --- DEFAULT CONFIGURATION (Fallbacks only) ---
 DEFAULT_WORKING_LOG_PATH = "logs/working_log.txt"
+DEFAULT_ERROR_LOG_PATH = "logs/error_log.txt"
 DEFAULT_IMAGE_ARCHIVE_DIR = "archive/detections"
 # [REMOVED] DEFAULT_IMAGE_PULL_DELAY_S is removed as it's no longer needed.
-# How often to check the deter_flag when it's False (Polling interval)
+# Max wait for a deter_flag notification before re-checking the flag and draining the error log
 DEFAULT_POLL_INTERVAL_S = 0.5 
 DEFAULT_MAX_FAIL = 5
+# Max ErrorEntry items drained from DataBus.error_log per step (one write per batch)
+DEFAULT_ERROR_BATCH_SIZE = 64
+# Log files stay open with a userspace buffer; buffered lines reach the OS at most this late
+DEFAULT_FLUSH_INTERVAL_S = 1.0
+LOG_BUFFER_SIZE = 1 << 16
+# Serialized working-log lines are queued and written together (one writelines per flush);
+# a full batch is written without waiting for the interval
+LOG_FLUSH_BATCH = 64
+LOG_PENDING_MAX = 256
+# Archived snapshots: q85 + optimized Huffman tables is about half the bytes of OpenCV's default q95
+DEFAULT_ARCHIVE_JPEG_QUALITY = 85
+
+
+def format_log_entry(
+    event_id: str,
+    timestamp_utc: str,
+    source_json: str,
+    motor_location: Dict[str, Any],
+    image_info: Dict[str, Any],
+    archive_field: Optional[Tuple[str, str]] = None,
+) -> bytes:
+    """
+    Serialize one working-log line. The entry has a fixed shape, so the outer
+    object is a template and only the two nested dicts (and the free-form
+    strings) go through json.dumps; the result is byte-identical to
+    json.dumps() of the equivalent dict. event_id and timestamp_utc are
+    strftime output (digits and separators) and need no escaping.
+    """
+    archive = ""
+    if archive_field is not None:
+        archive = f', "{archive_field[0]}": {json.dumps(archive_field[1])}'
+    return (
+        f'{{"event_id": "{event_id}", "timestamp_utc": "{timestamp_utc}", '
+        f'"trigger_source": {source_json}, '
+        f'"motor_location": {json.dumps(motor_location, default=json_default)}, '
+        f'"processed_image_info": {json.dumps(image_info, default=json_default)}'
+        f'{archive}}}\n'
+    ).encode("utf-8")
 
 
 class LoggerModule(BaseModule):
@@ -73,22 +119,99 @@ class LoggerModule(BaseModule):
         # 2. Logger Specific Configuration
         self.log_path: str = get_cfg("working_log_path", DEFAULT_WORKING_LOG_PATH)
         self.archive_dir: str = get_cfg("image_archive_dir", DEFAULT_IMAGE_ARCHIVE_DIR)
+        self.error_log_path: str = get_cfg("error_log_path", DEFAULT_ERROR_LOG_PATH)
+        self.error_batch_size: int = int(get_cfg("error_batch_size", DEFAULT_ERROR_BATCH_SIZE))
         # [REMOVED] self.image_pull_delay_s configuration is removed.
         self.poll_interval_s: float = float(get_cfg("poll_interval_s", DEFAULT_POLL_INTERVAL_S))
+        self.flush_interval_s: float = float(get_cfg("flush_interval_s", DEFAULT_FLUSH_INTERVAL_S))
+        self.archive_jpeg_quality: int = int(get_cfg("archive_jpeg_quality", DEFAULT_ARCHIVE_JPEG_QUALITY))
+        self._archive_params: List[int] = [
+            int(cv2.IMWRITE_JPEG_QUALITY), self.archive_jpeg_quality,
+            int(cv2.IMWRITE_JPEG_OPTIMIZE), 1,
+        ] if cv2 is not None else []
 
         # 3. Internal State
         # Flag to ensure a single TRUE->FALSE deter_flag cycle is logged only once
         self._is_logging_active: bool = False 
+        # Long-lived buffered log files (opened in setup, closed in teardown)
+        self._log_fh: Optional[BinaryIO] = None
+        self._error_fh: Optional[BinaryIO] = None
+        self._unflushed: bool = False
+        self._last_flush_ts: float = 0.0
+        # Working-log lines serialized by _log_event, written by _flush_files
+        self._pending: Deque[bytes] = deque(maxlen=LOG_PENDING_MAX)
+        # Single worker for snapshot encode + disk write, so an archive never stalls the logger thread
+        self._io_pool: Optional[ThreadPoolExecutor] = None
+        # Constant part of every working-log entry, serialized once
+        self._source_json: str = json.dumps(self.name)
+        # DataBus methods used on every step, bound once
+        self._get_deter_flag = data_bus.get_deter_flag
+        # Own notification Event: set on the deter_flag False -> True edge and
+        # cleared only here, so no other waiter can swallow a trigger
+        self._trigger = data_bus.register_state_waiter("logger.trigger")
 
     def setup(self) -> None:
         """Create necessary directories."""
         os.makedirs(os.path.dirname(self.log_path), exist_ok=True)
+        os.makedirs(os.path.dirname(self.error_log_path), exist_ok=True)
         os.makedirs(self.archive_dir, exist_ok=True)
+        # Opened once: each entry is a buffered write instead of open/write/close
+        self._log_fh = open(self.log_path, 'ab', buffering=LOG_BUFFER_SIZE)
+        self._error_fh = open(self.error_log_path, 'ab', buffering=LOG_BUFFER_SIZE)
+        self._io_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"{self.name}-io")
         print(f"[{self.name}] Setup: Logging to {self.log_path}, archiving to {self.archive_dir}.")
         
+    def stop(self) -> None:
+        """Request stop and interrupt the wait in step() right away."""
+        super().stop()
+        self._trigger.set()
+
     def teardown(self) -> None:
-        """Cleanup hook."""
-        pass
+        """Finish queued archives, write out any pending log lines and ErrorEntry items, then close the log files."""
+        if self._io_pool is not None:
+            self._io_pool.shutdown(wait=True)
+            self._io_pool = None
+        self._flush_error_log()
+        self._flush_files(time.time(), force=True)
+        for fh in (self._log_fh, self._error_fh):
+            if fh is not None:
+                fh.close() # flushes the buffer
+        self._log_fh = self._error_fh = None
+
+    def _flush_files(self, now: float, force: bool = False) -> None:
+        """
+        Write the pending working-log lines with one writelines() and flush both
+        log files to the OS. Runs at most once per flush_interval_s unless a full
+        batch is pending or force is set.
+        """
+        if (not force
+                and len(self._pending) < LOG_FLUSH_BATCH
+                and now - self._last_flush_ts < self.flush_interval_s):
+            return
+        self._last_flush_ts = now
+
+        if self._pending:
+            entries = list(self._pending)
+            self._pending.clear()
+            try:
+                self._log_fh.writelines(entries)
+                self._unflushed = True
+            except Exception as e:
+                # Report failure to error_log queue
+                self.data_bus.push_error(
+                    self.name, "ERROR",
+                    f"Failed to write log file ({len(entries)} entries dropped): {e}",
+                    timestamp=now,
+                )
+
+        if not self._unflushed:
+            return
+        try:
+            self._log_fh.flush()
+            self._error_fh.flush()
+        except Exception as e:
+            print(f"[{self.name}] Failed to flush log files: {e}")
+        self._unflushed = False
 
     def _log_event(self) -> None:
         """
@@ -97,74 +220,145 @@ class LoggerModule(BaseModule):
         """
         timestamp = time.time()
         # Create a unique ID based on the timestamp for file and log entry
-        event_id = datetime.fromtimestamp(timestamp).strftime("%Y%m%d_%H%M%S")
-        log_entry: Dict[str, Any] = {
-            "event_id": event_id,
-            "timestamp_utc": datetime.utcfromtimestamp(timestamp).isoformat(),
-            "trigger_source": self.name,
-        }
+        # (time.strftime on struct_time: no datetime objects, no deprecated utcfromtimestamp)
+        event_id = time.strftime("%Y%m%d_%H%M%S", time.localtime(timestamp))
+        timestamp_utc = (time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(timestamp))
+                         + f".{int(timestamp % 1 * 1e6):06d}")
 
         # --- A. Immediate State Logging (motor_location) ---
-        log_entry["motor_location"] = self.data_bus.get_state("motor_location", {})
+        motor_location = self.data_bus.get_motor_location()
         
         # --- B. Direct Image Pull and Archiving from Registry ---
         
-        # [MODIFIED] Pull the latest image item from the DataBus registry.
-        # This is thread-safe and guaranteed to return the last item written by YoloDetector.
-        latest_item: Optional[ProcessedImageItem] = self.data_bus.get_state(
-            "latest_processed_image_item",
+        # [MODIFIED] Pull the latest (annotated frame, detection) pair from the DataBus registry.
+        # This is thread-safe and guaranteed to return the last pair written by YoloDetector.
+        latest: Optional[Tuple[Any, DetectionItem]] = self.data_bus.get_state(
+            "latest_annotated_frame",
             None
         )
 
-        if latest_item:
+        archive_field: Optional[Tuple[str, str]] = None
+        if latest:
+            frame, det_item = latest
             # 1. Log Image Metadata (Detections, Timestamp, etc.)
-            image_meta = {
-                "item_timestamp": latest_item.timestamp,
-                "width": latest_item.frame.shape[1] if hasattr(latest_item.frame, 'shape') else 'N/A',
-                "height": latest_item.frame.shape[0] if hasattr(latest_item.frame, 'shape') else 'N/A',
-                "detection_count": len(latest_item.boxes),
-                "meta": latest_item.meta,
+            image_meta: Dict[str, Any] = {
+                "item_timestamp": det_item.timestamp,
+                "width": frame.shape[1] if hasattr(frame, 'shape') else 'N/A',
+                "height": frame.shape[0] if hasattr(frame, 'shape') else 'N/A',
+                "detection_count": len(det_item.boxes),
+                "meta": det_item.meta,
             }
-            log_entry["processed_image_info"] = image_meta
             
             # 2. Archive the annotated image
             archive_filename = f"{event_id}_det.jpg"
             archive_path = os.path.join(self.archive_dir, archive_filename)
             
-            try:
-                # Assuming cv2 is available for image saving
-                import cv2 
-                # latest_item.frame is assumed to be a numpy array/cv2 frame
-                cv2.imwrite(archive_path, latest_item.frame)
-                log_entry["image_archive_path"] = archive_path
-            except Exception as e:
-                log_entry["image_archive_error"] = f"Failed to save image: {e}"
+            if cv2 is None:
+                archive_field = ("image_archive_error", "Failed to save image: cv2 is not installed")
+            else:
+                # The annotated frame is the camera buffer the detector drew on in
+                # place. A published frame is never released to the FramePool, so it
+                # is not written again and the worker can encode it without a copy.
+                # Failures are reported to DataBus.error_log by the worker.
+                self._io_pool.submit(self._archive_image, archive_path, frame)
+                archive_field = ("image_archive_path", archive_path)
                 
         else:
             # If the item is None (e.g., system started but no frame processed yet)
-            log_entry["processed_image_info"] = {"status": "No image item found in registry."}
+            image_meta = {"status": "No image item found in registry."}
+
 
+        # --- C. Queue entry for working_log.txt (written by _flush_files) ---
+        self._pending.append(format_log_entry(
+            event_id, timestamp_utc, self._source_json, motor_location, image_meta, archive_field,
+        ))
+        print(f"[{self.name}] LOGGED EVENT: {event_id}. Image archive queued.")
 
-        # --- C. Write entry to working_log.txt ---
+    def _archive_image(self, archive_path: str, frame: Any) -> None:
+        """
+        Encode and write one snapshot (runs on the I/O worker; cv2 releases the GIL meanwhile).
+        The JPEG is encoded in memory and written with raw os.write calls, bypassing
+        imwrite's own buffered FILE* layer.
+        """
         try:
-            with open(self.log_path, 'a') as f:
-                # Use the json_default helper to serialize complex types
-                f.write(json.dumps(log_entry, default=json_default) + "\n")
-            print(f"[{self.name}] LOGGED EVENT: {event_id}. Image archive complete.")
+            # frame is assumed to be a numpy array/cv2 frame
+            ok, buf = cv2.imencode(".jpg", frame, self._archive_params)
+            if not ok:
+                raise IOError("cv2.imencode returned False")
+            data = memoryview(buf).cast("B")
+            fd = os.open(archive_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            try:
+                while data:
+                    data = data[os.write(fd, data):]
+            finally:
+                os.close(fd)
         except Exception as e:
-            # Report failure to error_log queue
-            self.data_bus.queue_put(
-                self.data_bus.error_log,
-                ErrorEntry(timestamp, self.name, "ERROR", f"Failed to write log file: {e}"),
-                drop_oldest_if_full=True
-            )
+            self.data_bus.push_error(self.name, "ERROR", f"Failed to save image {archive_path}: {e}")
+
+    def _flush_error_log(self) -> None:
+        """
+        Drain up to error_batch_size ErrorEntry items from DataBus.error_log and
+        up to as many detection events from DataBus.detection_log, and append
+        them to the error log file with a single write. Detection events are
+        formatted here, off the detector thread, as INFO entries.
+        """
+        batch: List[ErrorEntry] = self.data_bus.drain_queue(
+            self.data_bus.error_log,
+            max_items=self.error_batch_size,
+        )
+        events = self._drain_detection_log()
+        if not batch and not events:
+            return
+
+        lines = [
+            json.dumps(
+                {
+                    "timestamp": ts,
+                    "module": module,
+                    "level": "INFO",
+                    "message": f"Detection found: {count} object(s).",
+                    "details": None,
+                }
+            ) + "\n"
+            for ts, module, count in events
+        ]
+        lines += [
+            json.dumps(
+                {
+                    "timestamp": entry.timestamp,
+                    "module": entry.module,
+                    "level": entry.level,
+                    "message": entry.message,
+                    "details": entry.details,
+                },
+                default=json_default,
+            ) + "\n"
+            for entry in batch
+        ]
+        try:
+            self._error_fh.write("".join(lines).encode("utf-8"))
+            self._unflushed = True
+        except Exception as e:
+            print(f"[{self.name}] Failed to write error log ({len(lines)} entries dropped): {e}")
+
+    def _drain_detection_log(self) -> List[Tuple[float, str, int]]:
+        """Pop up to error_batch_size (timestamp, module, count) events, oldest first."""
+        log = self.data_bus.detection_log
+        events = []
+        for _ in range(min(len(log), self.error_batch_size)):
+            try:
+                events.append(log.popleft())
+            except IndexError:
+                break
+        return events
 
     def step(self) -> None:
         """
-        Periodically checks the deter_flag state and ensures the logging process 
+        Checks the deter_flag state on each notification (or poll timeout) and ensures the logging process 
         is triggered only once per event cycle (TRUE->FALSE transition).
+        Also drains DataBus.error_log in batches to the error log file.
         """
-        current_flag = self.data_bus.get_state("deter_flag", False)
+        current_flag = self._get_deter_flag()
 
         if current_flag and not self._is_logging_active:
             # State transition: FALSE -> TRUE (New event detected)
@@ -178,5 +372,12 @@ class LoggerModule(BaseModule):
 
         # If the flag is TRUE and logging is active (event in progress), we do nothing 
         # and wait for DecisionLogicModule to reset the flag.
+
+        self._flush_error_log()
+        self._flush_files(time.time())
         
-        time.sleep(self.poll_interval_s)
\ No newline at end of file
+        # Woken immediately on the deter_flag False -> True edge (logger.trigger);
+        # the timeout still drives the error-log drain and the TRUE -> FALSE reset.
+        # Cleared before the next step re-reads the flag, so no edge is lost.
+        if self._trigger.wait(timeout=self.poll_interval_s):
+            self._trigger.clear()
\ No newline at end of file
@@ -50,7 +50,8 @@ DataBus interface (registry-based):
 
     - "lora.health": dict
         A shared health summary updated by this module, for watchdog
-        and http_server to read. Example structure:
+        and http_server to read. Related fields are written together with
+        one dict.update() call. Example structure:
             {
                 "rx_count": int,
                 "tx_count": int,
@@ -73,15 +74,34 @@ DataBus interface (registry-based):
 This module is designed as a SerialModule subclass, to be monitored by your watchdog.
 """
 
+import re
+import select
 import time
 import queue
-from typing import Optional, Dict, Any
+from typing import Any, Callable, Dict, Optional
 
 import serial  # pyserial
 
 from data_bus import DataBus
 from serial_module import SerialModule
 
+# "RSSI:<val> dBm, SNR:<snr_raw>/4 dB" (SNR part optional, "/4" = raw quarter-dB units)
+RSSI_SNR_RE = re.compile(
+    rb"RSSI:\s*(-?\d+(?:\.\d+)?)\s*(?:dBm)?\s*(?:,\s*SNR:\s*(-?\d+(?:\.\d+)?)\s*(/4)?)?"
+)
+
+# Preallocated RX line-assembly buffer (grows only for a longer partial line)
+RX_BUF_SIZE = 4096
+
+# RP2040 status lines counted as link errors in the health summary
+LORA_ERROR_STATUS = frozenset({
+    b"RXERROR",
+    b"TXTIMEOUT",
+    b"OnTxTimeout",
+    b"OnRxTimeout",
+    b"OnRxError",
+    b"RXTIMEOUT",
+})
 
 class LoRaCommModule(SerialModule):
     """
@@ -112,15 +132,36 @@ class LoRaCommModule(SerialModule):
             lambda: queue.Queue(maxsize=10),
         )
 
-        # Internal RX buffer for assembling lines
-        self._rx_buf = bytearray()
+        # Internal RX buffer for assembling lines: preallocated, only the first
+        # _rx_len bytes are valid (the partial line carried between reads)
+        self._rx_buf = bytearray(RX_BUF_SIZE)
+        self._rx_len: int = 0
 
         # Pending RX payload waiting for RSSI line
         self._pending_rx: Optional[Dict[str, Any]] = None
 
+        # poll() on the serial fd: step() sleeps in the kernel until RP2040 sends
+        # something instead of spinning on in_waiting. Rebuilt when the port is
+        # reopened (new fd).
+        self._poller: Optional[select.poll] = None
+        self._poll_fd: int = -1
+
+        # DataBus method used for every completed RX, bound once
+        self._queue_put = self.data_bus.queue_put
+
+        # Line handlers keyed by the tag before the first ':' ("RX", "RSSI")
+        self._line_handlers: Dict[bytes, Callable[[bytes, float], None]] = {
+            b"RX": self._on_rx_line,
+            b"RSSI": self._on_rssi_line,
+        }
+
         # Simple TX rate limiting (to avoid flooding RP2040)
         self.last_tx_time: float = 0.0
         self.min_tx_interval: float = 0.05  # seconds
+        # Max TX lines coalesced into one serial write; the batch size is also
+        # bounded by the time since the last send, so the average TX rate stays
+        # at most one line per min_tx_interval.
+        self.max_tx_batch: int = 4
 
         # Health summary shared via DataBus registry
         default_health = {
@@ -141,6 +182,16 @@ class LoRaCommModule(SerialModule):
             lambda: default_health.copy(),
         )
 
+    def teardown(self):
+        """Push out any bytes still buffered for RP2040, then close the port."""
+        try:
+            if self.ser is not None and self.ser.is_open:
+                self.ser.flush()
+        except (OSError, serial.SerialException) as e:
+            self.logger.error(f"Serial flush error on teardown: {e}")
+        finally:
+            super().teardown()
+
     # ------------------------------------------------------------------
     # BaseModule required step()
     # ------------------------------------------------------------------
@@ -148,27 +199,43 @@ class LoRaCommModule(SerialModule):
     def step(self):
         """
         One iteration of the module logic:
-            1) Read and parse any available lines from RP2040.
-            2) Send at most one pending TX message to RP2040.
+            1) Wait (poll) for data from RP2040, at most until the next TX is due,
+               then read and parse any available lines.
+            2) Send pending TX messages to RP2040 (one write per batch).
         """
         # 1) Ensure serial port is available (SerialModule helper)
         self._ensure_serial()
 
         # 2) Read and parse incoming data from serial
-        self._read_serial_and_parse()
+        if self.ser is not None and self.ser.is_open:
+            if self.tx_queue.empty():
+                timeout = self.min_tx_interval
+            else:
+                timeout = max(0.0, self.last_tx_time + self.min_tx_interval - time.time())
+            if self._wait_readable(timeout):
+                self._read_serial_and_parse()
 
-        # 3) Send pending TX message, if any
-        self._send_one_tx_if_available()
+        # 3) Send pending TX messages, if any
+        self._send_tx_batch()
 
     # ------------------------------------------------------------------
     # Serial reading and parsing
     # ------------------------------------------------------------------
 
+    def _wait_readable(self, timeout: float) -> bool:
+        """Block up to timeout seconds until the serial fd is readable."""
+        fd = self.ser.fileno()
+        if fd != self._poll_fd:
+            self._poller = select.poll()
+            self._poller.register(fd, select.POLLIN)
+            self._poll_fd = fd
+        return bool(self._poller.poll(timeout * 1000.0))
+
     def _read_serial_and_parse(self):
         """
         Read all available bytes from serial (non-blocking) and parse
-        into text lines separated by '\n'. For each line, call
-        _handle_line().
+        into text lines separated by '\n' (one split per read, no per-line
+        buffer shifting). For each line, call _handle_line().
         """
         if self.ser is None or not self.ser.is_open:
             return
@@ -199,210 +266,199 @@ class LoRaCommModule(SerialModule):
         if not data:
             return
 
-        self._rx_buf.extend(data)
-
-        # Process all complete lines currently in the buffer
-        while True:
-            newline_idx = self._rx_buf.find(b"\n")
-            if newline_idx == -1:
-                break  # no complete line yet
-
-            # Extract one line including '\n'
-            line_bytes = self._rx_buf[: newline_idx + 1]
-            del self._rx_buf[: newline_idx + 1]
-
-            # Decode to string
-            try:
-                line = line_bytes.decode("utf-8", errors="replace")
-            except UnicodeDecodeError:
-                line = line_bytes.decode("latin1", errors="replace")
-
-            line = line.rstrip("\r\n")
+        buf = self._rx_buf
+        start = self._rx_len
+        end = start + len(data)
+        if end > len(buf):
+            # Line longer than the buffer: grow once, the size is then kept
+            buf.extend(bytes(end - len(buf)))
+        buf[start:end] = data
+
+        last_nl = buf.rfind(b"\n", start, end)
+        if last_nl == -1:
+            self._rx_len = end
+            return  # no complete line yet
+
+        # Split all complete lines in one pass (one copy of the complete part);
+        # the trailing fragment moves to the buffer head for the next read.
+        # Lines stay bytes (hashable, for the handler table); only the fields
+        # that are stored get decoded.
+        with memoryview(buf) as view:
+            lines = bytes(view[:last_nl]).split(b"\n")
+        tail = end - last_nl - 1
+        buf[:tail] = buf[last_nl + 1:end]
+        self._rx_len = tail
+
+        last_line = b""
+        for line in lines:
+            line = line.rstrip(b"\r")
             if line:
                 self._handle_line(line)
+                last_line = line
+
+        if last_line:
+            # Only the most recent line is kept, so decode just that one
+            self.health["last_status_line"] = last_line.decode("utf-8", errors="replace")
 
     # ------------------------------------------------------------------
     # Parsing RP2040 output lines and updating health
     # ------------------------------------------------------------------
 
-    def _handle_line(self, line: str):
+    def _handle_line(self, line: bytes):
         """
-        Handle one complete line from RP2040 and update the health summary.
+        Handle one complete (undecoded) line from RP2040 and update the health
+        summary. Dispatches on the "<prefix>:" tag with one dict lookup, then
+        checks the bare status lines against a frozenset; status lines such as
+        "TXDONE" are never decoded.
         """
         ts = time.time()
 
-        self.logger.debug(f"LoRa bridge line: {line}")
-        self.health["last_status_line"] = line
-
-        # RX payload line
-        if line.startswith("RX:"):
-            payload = line[3:]
+        self.logger.debug("LoRa bridge line: %r", line)
 
-            # Update health summary for RX
-            self.health["rx_count"] += 1
-            self.health["last_rx_ts"] = ts
-            self.health["last_rx_payload"] = payload
+        tag, sep, _ = line.partition(b":")
+        handler = self._line_handlers.get(tag) if sep else None
+        if handler is not None:
+            handler(line, ts)
 
-            # If there is already a pending RX without RSSI, push it anyway
-            if self._pending_rx is not None:
-                self.logger.warning(
-                    "Previous RX had no RSSI line; pushing it without link quality."
+        # Status / error lines
+        elif line in LORA_ERROR_STATUS:
+            # Treat these as errors for health purposes
+            health = self.health
+            health.update({
+                "error_count": health["error_count"] + 1,
+                "last_error_ts": ts,
+                "last_error_type": line.decode("ascii"),
+            })
+            # self.data_bus.log_error(self.name, "ERROR",
+            #                         f"LoRa status: {line}")
+
+        # TXDONE does not change tx_count here, because it is already updated
+        # when we send the command successfully. Any other debug / info lines
+        # from RP2040 are only logged; health["last_status_line"] is updated
+        # by _read_serial_and_parse.
+
+    def _on_rx_line(self, line: bytes, ts: float):
+        """RX payload line: start a new pending RX entry (waiting for RSSI)."""
+        line = line.decode("utf-8", errors="replace")
+        payload = line[3:]
+
+        # Update health summary for RX
+        health = self.health
+        health.update({
+            "rx_count": health["rx_count"] + 1,
+            "last_rx_ts": ts,
+            "last_rx_payload": payload,
+        })
+
+        # If there is already a pending RX without RSSI, push it anyway
+        if self._pending_rx is not None:
+            self.logger.warning(
+                "Previous RX had no RSSI line; pushing it without link quality."
+            )
+            try:
+                self._queue_put(
+                    self.rx_queue,
+                    self._pending_rx,
+                    drop_oldest_if_full=True,
                 )
-                try:
-                    self.data_bus.queue_put(
-                        self.rx_queue,
-                        self._pending_rx,
-                        drop_oldest_if_full=True,
-                    )
-                except Exception as e:
-                    self.logger.error(
-                        f"Failed to push pending RX into lora.rx_queue: {e}"
-                    )
-
-            # Start a new pending RX entry
-            self._pending_rx = {
-                "timestamp": ts,
-                "payload": payload,
-                "rssi_dbm": None,
-                "snr_db": None,
-                "raw_lines": [line],
-            }
-
-        # RSSI/SNR line, expected after RX
-        elif line.startswith("RSSI:"):
-            rssi_dbm, snr_db = self._parse_rssi_snr(line)
-
-            # Update health summary with latest link quality
-            self.health["last_rssi_dbm"] = rssi_dbm
-            self.health["last_snr_db"] = snr_db
-
-            if self._pending_rx is not None:
-                self._pending_rx["rssi_dbm"] = rssi_dbm
-                self._pending_rx["snr_db"] = snr_db
-                self._pending_rx["raw_lines"].append(line)
-
-                # Push the completed RX entry to the RX queue
-                try:
-                    self.data_bus.queue_put(
-                        self.rx_queue,
-                        self._pending_rx,
-                        drop_oldest_if_full=True,
-                    )
-                except Exception as e:
-                    self.logger.error(
-                        f"Failed to push RX message into lora.rx_queue: {e}"
-                    )
-
-                self._pending_rx = None
-            else:
-                # RSSI arrived without a matching RX line
-                self.logger.warning(
-                    "Received RSSI line without pending RX payload."
+            except Exception as e:
+                self.logger.error(
+                    f"Failed to push pending RX into lora.rx_queue: {e}"
                 )
 
-        # Status / error lines
-        elif line in (
-            "TXDONE",
-            "RXTIMEOUT",
-            "RXERROR",
-            "TXTIMEOUT",
-            "OnTxTimeout",
-            "OnRxTimeout",
-            "OnRxError",
-        ):
-            # Treat most of these as errors for health purposes
-            if line in (
-                "RXERROR",
-                "TXTIMEOUT",
-                "OnTxTimeout",
-                "OnRxTimeout",
-                "OnRxError",
-                "RXTIMEOUT",
-            ):
-                self.health["error_count"] += 1
-                self.health["last_error_ts"] = ts
-                self.health["last_error_type"] = line
-                # self.data_bus.log_error(self.name, "ERROR",
-                #                         f"LoRa status: {line}")
-
-            # For TXDONE we do not change tx_count here, because it is
-            # already updated when we send the command successfully.
+        # Start a new pending RX entry
+        self._pending_rx = {
+            "timestamp": ts,
+            "payload": payload,
+            "rssi_dbm": None,
+            "snr_db": None,
+            "raw_lines": [line],
+        }
+
+    def _on_rssi_line(self, line: bytes, ts: float):
+        """RSSI/SNR line, expected after RX: completes the pending RX entry."""
+        rssi_dbm, snr_db = self._parse_rssi_snr(line)
 
+        # Update health summary with latest link quality
+        self.health.update({"last_rssi_dbm": rssi_dbm, "last_snr_db": snr_db})
+
+        if self._pending_rx is not None:
+            self._pending_rx["rssi_dbm"] = rssi_dbm
+            self._pending_rx["snr_db"] = snr_db
+            self._pending_rx["raw_lines"].append(line.decode("utf-8", errors="replace"))
+
+            # Push the completed RX entry to the RX queue
+            try:
+                self._queue_put(
+                    self.rx_queue,
+                    self._pending_rx,
+                    drop_oldest_if_full=True,
+                )
+            except Exception as e:
+                self.logger.error(
+                    f"Failed to push RX message into lora.rx_queue: {e}"
+                )
+
+            self._pending_rx = None
         else:
-            # Any other debug / info lines from RP2040 are only logged;
-            # health["last_status_line"] is already updated above.
-            pass
+            # RSSI arrived without a matching RX line
+            self.logger.warning(
+                "Received RSSI line without pending RX payload."
+            )
 
     @staticmethod
-    def _parse_rssi_snr(line: str):
+    def _parse_rssi_snr(line: bytes):
         """
         Parse RSSI/SNR line of the form:
             "RSSI:<val> dBm, SNR:<snr_raw>/4 dB"
         Returns (rssi_dbm: Optional[float], snr_db: Optional[float]).
+        A missing or malformed field is returned as None.
         """
-        rssi_dbm = None
-        snr_db = None
-
-        try:
-            parts = [p.strip() for p in line.split(",")]
-
-            # First part: "RSSI:<val> dBm"
-            if parts:
-                if parts[0].startswith("RSSI:"):
-                    rssi_str = parts[0][len("RSSI:") :].strip()
-                    if rssi_str.endswith("dBm"):
-                        rssi_str = rssi_str[:-3].strip()
-                    rssi_dbm = float(rssi_str)
-
-            # Second part: "SNR:<snr_raw>/4 dB"
-            if len(parts) > 1 and "SNR:" in parts[1]:
-                snr_part = parts[1]
-                idx = snr_part.find("SNR:")
-                if idx != -1:
-                    snr_str = snr_part[idx + len("SNR:") :].strip()
-                    if snr_str.endswith("dB"):
-                        snr_str = snr_str[:-2].strip()
-                    if "/4" in snr_str:
-                        raw_str = snr_str.split("/4", 1)[0].strip()
-                        raw_val = float(raw_str)
-                        snr_db = raw_val / 4.0
-                    else:
-                        snr_db = float(snr_str)
-        except Exception:
-            # If parsing fails, just return None for both
-            pass
-
-        return rssi_dbm, snr_db
+        m = RSSI_SNR_RE.match(line)
+        if m is None:
+            return None, None
+        rssi_str, snr_str, quarter = m.groups()
+        rssi_dbm = float(rssi_str)
+        if snr_str is None:
+            return rssi_dbm, None
+        snr_db = float(snr_str)
+        return rssi_dbm, (snr_db / 4.0 if quarter else snr_db)
 
     # ------------------------------------------------------------------
     # TX towards RP2040
     # ------------------------------------------------------------------
 
-    def _send_one_tx_if_available(self):
+    def _send_tx_batch(self):
         """
-        Pop at most one message from lora.tx_queue and send it to RP2040
-        in the form "TX:<payload>\\n".
+        Pop up to max_tx_batch messages from lora.tx_queue (as many as the rate
+        limit allows) and send them to RP2040 as "TX:<payload>\\n" lines in a
+        single serial write.
         Also updates the health summary when a TX is attempted.
         """
         if self.ser is None or not self.ser.is_open:
             return
 
         now = time.time()
-        if now - self.last_tx_time < self.min_tx_interval:
+        budget = min(self.max_tx_batch, int((now - self.last_tx_time) / self.min_tx_interval))
+        if budget <= 0:
             return
 
-        # Non-blocking get from tx_queue
-        msg = self.data_bus.queue_get(self.tx_queue, timeout=0)
-        if msg is None:
+        # Non-blocking drain from tx_queue
+        msgs = self.data_bus.drain_queue(self.tx_queue, max_items=budget)
+        if not msgs:
             return
 
-        payload_str = self._encode_payload(msg)
-        line = f"TX:{payload_str}\n"
-        data = line.encode("utf-8", errors="replace")
+        payloads = [self._encode_payload(msg) for msg in msgs]
+        data = bytearray()
+        for payload_str in payloads:
+            data += b"TX:"
+            data += payload_str.encode("utf-8", errors="replace")
+            data += b"\n"
 
+        # No flush() here: it blocks until the OS has drained the bytes to the
+        # USB-CDC endpoint, which the driver does on its own. teardown() flushes.
         try:
             self.ser.write(data)
-            self.ser.flush()
         except (
             OSError,
             serial.SerialTimeoutException,
@@ -410,19 +466,23 @@ class LoRaCommModule(SerialModule):
         ) as e:
             self.logger.error(f"Serial write error: {e}")
             # Consider this a communication error
-            self.health["error_count"] += 1
-            self.health["last_error_ts"] = now
-            self.health["last_error_type"] = "SERIAL_WRITE_ERROR"
+            health = self.health
+            health.update({
+                "error_count": health["error_count"] + 1,
+                "last_error_ts": now,
+                "last_error_type": "SERIAL_WRITE_ERROR",
+            })
             # self.data_bus.log_error(self.name, "ERROR",
             #                         "LoRa serial write error", str(e))
             raise
 
         # Update TX-related health
         self.last_tx_time = now
-        self.health["tx_count"] += 1
-        self.health["last_tx_ts"] = now
+        health = self.health
+        health.update({"tx_count": health["tx_count"] + len(payloads), "last_tx_ts": now})
 
-        self.logger.debug(f"LoRa TX (to RP2040): {payload_str}")
+        for payload_str in payloads:
+            self.logger.debug(f"LoRa TX (to RP2040): {payload_str}")
 
     @staticmethod
     def _encode_payload(msg) -> str:
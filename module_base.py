@@ -15,7 +15,7 @@ class BaseModule(ABC, threading.Thread):
     Responsibilities:
       - Run as a dedicated thread.
       - Call step() in a loop to perform actual work.
-      - Collect health metrics (read by the watchdog, written to the data bus by watchdog).
+      - Collect health metrics and publish them to this module's DataBus health slot.
       - Automatically stop the module when too many consecutive failures occur.
 
     Conventions:
@@ -30,10 +30,17 @@ class BaseModule(ABC, threading.Thread):
         daemon: bool = True,
         max_consecutive_fail: int = 5,
         fail_backoff_s: float = 0.1,
+        register_health: bool = True,
     ):
         super().__init__(name=name, daemon=daemon)
         self.name = name
         self.data_bus = data_bus
+        # Reserve this module's own health slot on the bus (single writer).
+        # register_health=False for a module used only as a component of another
+        # module (never started), so it leaves no empty slot in /status.
+        self._register_health = register_health
+        if register_health:
+            data_bus.register_module_health(name)
         self._stop_event = threading.Event()
 
         # Consecutive failure control
@@ -41,7 +48,8 @@ class BaseModule(ABC, threading.Thread):
         self._fail_backoff_s = fail_backoff_s
         self._consecutive_fail = 0
 
-        # Health metrics (protected by lock)
+        # Health metrics (single writer: this thread; the lock orders the multi-field
+        # failure updates, the per-step success update is lock-free)
         self._health_lock = threading.Lock()
         self.last_beat_ts: float = 0.0
         self.last_step_duration: float = 0.0
@@ -69,6 +77,21 @@ class BaseModule(ABC, threading.Thread):
         """
         return self._stop_event.is_set()
 
+    def _publish_health(self) -> None:
+        """Copy the health metrics into this module's DataBus slot (read by /status)."""
+        if not self._register_health:
+            return
+        self.data_bus.update_module_health(
+            self.name,
+            ok_count=self.ok_count,
+            fail_count=self.fail_count,
+            consecutive_fail=self._consecutive_fail,
+            last_beat_ts=self.last_beat_ts,
+            last_step_duration=self.last_step_duration,
+            last_exception_str=self.last_exception_str,
+            last_exception_time=self.last_exception_time,
+        )
+
     # ---------- Optional setup/teardown hooks ----------
 
     def setup(self) -> None:
@@ -108,8 +131,8 @@ class BaseModule(ABC, threading.Thread):
           - Calls setup() once
           - Repeatedly calls step()
           - Measures duration
-          - Updates success/failure counters
-          - Stores last exception as a string with traceback
+          - Updates success/failure counters and publishes them to the DataBus
+          - Stores last exception as a string (with traceback once failures repeat)
           - Automatically stops this module after too many consecutive failures
           - Calls teardown() once on exit
         """
@@ -126,35 +149,53 @@ class BaseModule(ABC, threading.Thread):
                 self.last_exception_time = now
                 self.last_step_duration = 0.0
                 self.last_beat_ts = now
+            self._publish_health()
             # Setup failure: do not enter the main loop
             self._stop_event.set()
             return
 
-        # Main loop
+        # Main loop: step duration from the monotonic perf_counter, wall-clock
+        # time.time() only for the timestamps stored in health
+        perf_counter = time.perf_counter
         while not self._stop_event.is_set():
-            t0 = time.time()
+            t0 = perf_counter()
             try:
                 self.step()
+                dt = perf_counter() - t0
                 now = time.time()
-                with self._health_lock:
-                    self.ok_count += 1
-                    self._consecutive_fail = 0
-                    self.last_exception_str = ""
-                    self.last_exception_time = 0.0
-                    self.last_step_duration = now - t0
-                    self.last_beat_ts = now
+                # Success path without _health_lock: this thread is the only
+                # writer and each attribute store is atomic under the GIL, so a
+                # reader sees every field at a value it really had (fields may
+                # come from adjacent steps). Only the failure-path updates below
+                # are written under _health_lock; it does not make a read of
+                # these success fields consistent.
+                self.ok_count += 1
+                self._consecutive_fail = 0
+                self.last_exception_str = ""
+                self.last_exception_time = 0.0
+                self.last_step_duration = dt
+                self.last_beat_ts = now
+                self._publish_health()
 
             except Exception as e:
+                dt = perf_counter() - t0
                 now = time.time()
-                exc_str = f"{repr(e)}\n{traceback.format_exc()}"
+                # Formatting the traceback walks and renders the whole stack; only
+                # pay for it once the failure streak is halfway to stopping the
+                # module (forensics right before the kill), not for every
+                # transient failure.
+                exc_str = repr(e)
+                if self._consecutive_fail + 1 >= max(1, self.max_consecutive_fail // 2):
+                    exc_str = f"{exc_str}\n{traceback.format_exc()}"
 
                 with self._health_lock:
                     self.fail_count += 1
                     self._consecutive_fail += 1
                     self.last_exception_str = exc_str
                     self.last_exception_time = now
-                    self.last_step_duration = now - t0
+                    self.last_step_duration = dt
                     self.last_beat_ts = now
+                self._publish_health()
 
                 # Stop this module if too many consecutive failures
                 if self._consecutive_fail >= self.max_consecutive_fail:
@@ -173,3 +214,4 @@ class BaseModule(ABC, threading.Thread):
                 self.fail_count += 1
                 self.last_exception_str = exc_str
                 self.last_exception_time = now
+            self._publish_health()
@@ -1,7 +1,17 @@
+import ctypes
+import mmap
+import os
 import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 import serial
 import RPi.GPIO as GPIO
-from typing import Any, Optional
+from typing import Any, Callable, Dict, Optional
+
+try:
+    import pigpio  # DMA-timed step waveforms (needs the pigpiod daemon)
+except ImportError:
+    pigpio = None
 
 from module_base import BaseModule
 from data_bus import DataBus
@@ -21,14 +31,90 @@ STEPS_FULL_TURN = STEPS_PER_REV * MICROSTEPS
 # ---- Sweep Parameters ----
 SWEEP_ANGLE_TOTAL = 120      
 STEPS_TO_SWEEP = int((SWEEP_ANGLE_TOTAL / 360) * STEPS_FULL_TURN)
+# Sweep angle of every step index 0..STEPS_TO_SWEEP, computed once
+ANGLE_LUT = tuple(i / STEPS_TO_SWEEP * SWEEP_ANGLE_TOTAL for i in range(STEPS_TO_SWEEP + 1))
+# Status direction names indexed by (scan_direction + 1) // 2
+DIRECTION_NAMES = ("LEFT", "RIGHT")
 
 # ---- Timing ----
 STEP_DELAY = 0.005           # 5ms delay per pulse phase
 DIR_DELAY  = 0.2             # Pause duration when changing direction
+# Real-time placement of the motor thread (None = leave to the OS scheduler)
+DEFAULT_CPU_CORE = None      # e.g. 3 with isolcpus=3 on the kernel command line
+DEFAULT_RT_PRIORITY = None   # SCHED_FIFO priority 1-99 (needs CAP_SYS_NICE)
+# Pulse phases end on absolute perf_counter deadlines: sleep until this close
+# to the deadline (the scheduler's wake-up jitter), then busy-wait the rest
+SPIN_MARGIN_S = 0.0003
 
 # ---- LoRa Config ----
 SERIAL_PORT = '/dev/serial0'
 BAUD_RATE   = 9600
+SERIAL_RETRY_S = 5.0         # min interval between attempts to (re)open the port
+
+# ---- Direct GPIO register access (step pulses) ----
+GPIOMEM_PATH = "/dev/gpiomem"
+# SoCs whose GPIO block has the BCM2835 register layout (Pi 1-4). The Pi 5
+# (bcm2712) routes GPIO through the RP1 chip, which has a different layout.
+BCM283X_COMPATIBLE = (b"brcm,bcm2835", b"brcm,bcm2836", b"brcm,bcm2837", b"brcm,bcm2711")
+
+
+class GpioRegisters:
+    """
+    GPSET0/GPCLR0 of the BCM283x GPIO block, mapped through /dev/gpiomem.
+    Setting or clearing a pin is one 32-bit store into the mapping instead of
+    an RPi.GPIO call per edge. Pin direction is still configured by RPi.GPIO.
+    """
+
+    GPSET0 = 0x1C
+    GPCLR0 = 0x28
+
+    def __init__(self, path: str = GPIOMEM_PATH):
+        fd = os.open(path, os.O_RDWR | os.O_SYNC)
+        try:
+            self._mem = mmap.mmap(fd, 4096, mmap.MAP_SHARED, mmap.PROT_READ | mmap.PROT_WRITE)
+        finally:
+            os.close(fd)
+        self._gpset0 = ctypes.c_uint32.from_buffer(self._mem, self.GPSET0)
+        self._gpclr0 = ctypes.c_uint32.from_buffer(self._mem, self.GPCLR0)
+
+    def set(self, mask: int) -> None:
+        self._gpset0.value = mask
+
+    def clear(self, mask: int) -> None:
+        self._gpclr0.value = mask
+
+    def close(self) -> None:
+        # The ctypes views export the mapping; drop them before unmapping
+        self._gpset0 = self._gpclr0 = None
+        self._mem.close()
+
+
+def wait_until(deadline: float) -> float:
+    """
+    Block until time.perf_counter() reaches deadline and return the time it
+    was reached. Sleeps (GIL released) for all but SPIN_MARGIN_S, then spins,
+    so the edge lands within a few microseconds of the deadline instead of
+    time.sleep's ~100 us overshoot.
+    """
+    remaining = deadline - time.perf_counter()
+    if remaining > SPIN_MARGIN_S:
+        time.sleep(remaining - SPIN_MARGIN_S)
+    while (now := time.perf_counter()) < deadline:
+        pass
+    return now
+
+
+def open_gpio_registers() -> Optional[GpioRegisters]:
+    """Map the GPIO registers if this board has the BCM283x layout, else None."""
+    try:
+        with open("/proc/device-tree/compatible", "rb") as f:
+            compatible = f.read().split(b"\0")
+        if not any(c in BCM283X_COMPATIBLE for c in compatible):
+            return None
+        return GpioRegisters()
+    except OSError:
+        return None
+
 
 class MotorWithLora(BaseModule):
     
@@ -36,16 +122,26 @@ class MotorWithLora(BaseModule):
 
     def __init__(self, name: str, data_bus: DataBus, daemon: bool = True, **kwargs: Any):
         super().__init__(name=name, data_bus=data_bus, daemon=daemon, **kwargs)
+
+        self.config_prefix = self.CONFIG_PREFIX
+        cfg = data_bus.get_state("config", {})
+
+        def get_cfg(key: str, default: Any) -> Any:
+            """Retrieves a configuration value using the module's prefix."""
+            full_key = f"{self.config_prefix}_{key}"
+            return cfg.get(full_key, default)
+
+        self.cpu_core: Optional[int] = get_cfg("cpu_core", DEFAULT_CPU_CORE)
+        self.rt_priority: Optional[int] = get_cfg("rt_priority", DEFAULT_RT_PRIORITY)
         
-        # --- Serial / LoRa Initialization ---
+        # --- Serial / LoRa (opened and used only on the LoRa writer thread) ---
+        self.serial_port: str = get_cfg("serial_port", SERIAL_PORT)
+        self.serial_baud: int = int(get_cfg("serial_baud", BAUD_RATE))
         self.ser: Optional[serial.Serial] = None
-        try:
-            self.ser = serial.Serial(SERIAL_PORT, BAUD_RATE, timeout=1)
-            self.ser.flush()
-            print(f"[{self.name}] [INIT] Serial connected: {SERIAL_PORT}")
-        except Exception as e:
-            print(f"[{self.name}] [WARN] Serial init failed: {e}")
-            self.ser = None
+        self._serial_retry_at = 0.0
+
+        # Single writer thread for LoRa alerts (keeps the blocking UART write off the motor thread)
+        self._lora_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"{name}-lora")
 
         # --- Motion State ---
         self.current_step_index = 0
@@ -61,8 +157,24 @@ class MotorWithLora(BaseModule):
         self.deter_start_time = 0.0
         self.DETER_DURATION = 2.0  # Pause for 2 seconds upon detection
 
+        # --- Step pin writers (bound in setup: GPIO registers, or RPi.GPIO fallback) ---
+        self._gpio_regs: Optional[GpioRegisters] = None
+        self._step_high: Callable[[], None] = partial(GPIO.output, STEP_PIN, GPIO.HIGH)
+        self._step_low: Callable[[], None] = partial(GPIO.output, STEP_PIN, GPIO.LOW)
+        # Batch pulse generator (bound in setup: pigpio waveform if pigpiod is reachable)
+        self._pi: Optional[Any] = None
+        self._wave_ids: Dict[int, int] = {}
+        self._pulse_batch: Callable[[int], None] = self._pulse_software
+        # Software pulses run on a fixed perf_counter grid that carries across
+        # batches (None = re-anchor at the next pulse, e.g. after a pause)
+        self._next_pulse_t: Optional[float] = None
+        self.pulse_overruns = 0
+
     def setup(self) -> None:
-        """Initialize GPIO pins and calibrate."""
+        """Open the LoRa port, pin the motor thread, initialize GPIO pins and calibrate."""
+        self._lora_pool.submit(self._ensure_serial)
+        self._apply_realtime_placement()
+
         GPIO.setmode(GPIO.BCM)
         GPIO.setwarnings(False)
         GPIO.setup(DIR_PIN, GPIO.OUT)
@@ -71,18 +183,68 @@ class MotorWithLora(BaseModule):
         
         # Enable Motor (Active LOW)
         GPIO.output(EN_PIN, GPIO.LOW) 
-        print(f"[{self.name}] GPIO setup complete.")
+
+        # Step pulses through the mapped set/clear registers when available
+        self._gpio_regs = open_gpio_registers()
+        if self._gpio_regs is not None:
+            step_mask = 1 << STEP_PIN
+            self._step_high = partial(self._gpio_regs.set, step_mask)
+            self._step_low = partial(self._gpio_regs.clear, step_mask)
+
+        # Batch pulses as DMA-timed waveforms when the pigpio daemon is running
+        if pigpio is not None:
+            pi = pigpio.pi()
+            if pi.connected:
+                pi.set_mode(STEP_PIN, pigpio.OUTPUT)
+                pi.wave_clear()
+                self._pi = pi
+                self._pulse_batch = self._pulse_wave
+            else:
+                pi.stop()
+        if self._pi is not None:
+            pulse_source = "pigpio DMA waveform"
+        else:
+            pulse_source = "gpiomem registers" if self._gpio_regs else "RPi.GPIO"
+        print(f"[{self.name}] GPIO setup complete (step pulses via {pulse_source}).")
         
         self._startup_calibration()
 
     def teardown(self) -> None:
         """Cleanup resources."""
         GPIO.output(EN_PIN, GPIO.HIGH) # Disable motor
+        if self._pi is not None:
+            self._pi.wave_tx_stop()
+            self._pi.wave_clear()
+            self._pi.stop()
+            self._pi = None
+        if self._gpio_regs is not None:
+            self._gpio_regs.close()
+            self._gpio_regs = None
         GPIO.cleanup()
-        if self.ser:
-            self.ser.close()
+        # Let a queued alert go out before the port closes
+        self._lora_pool.shutdown(wait=True)
+        self._close_serial()
         print(f"[{self.name}] Cleanup complete.")
 
+    def _apply_realtime_placement(self) -> None:
+        """
+        Pin this thread to cpu_core and/or switch it to SCHED_FIFO rt_priority
+        (setup() runs on the module thread; pid 0 = the calling thread). Either
+        failing (no such core, missing CAP_SYS_NICE) only logs a warning.
+        """
+        if self.cpu_core is not None:
+            try:
+                os.sched_setaffinity(0, {int(self.cpu_core)})
+                print(f"[{self.name}] [INIT] Pinned to CPU {self.cpu_core}.")
+            except (AttributeError, OSError, ValueError) as e:
+                print(f"[{self.name}] [WARN] CPU pinning failed: {e}")
+        if self.rt_priority is not None:
+            try:
+                os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(int(self.rt_priority)))
+                print(f"[{self.name}] [INIT] SCHED_FIFO priority {self.rt_priority}.")
+            except (AttributeError, OSError, ValueError) as e:
+                print(f"[{self.name}] [WARN] Real-time scheduling failed: {e}")
+
     def _startup_calibration(self):
         """
         Performs a small 'wiggle' at startup.
@@ -99,40 +261,143 @@ class MotorWithLora(BaseModule):
         pin_lvl = GPIO.HIGH if direction == 1 else GPIO.LOW
         GPIO.output(DIR_PIN, pin_lvl)
         
+        step_high, step_low = self._step_high, self._step_low
+        deadline = time.perf_counter()
+        for _ in range(steps):
+            step_high()
+            deadline += 0.002
+            wait_until(deadline)
+            step_low()
+            deadline += 0.002
+            wait_until(deadline)
+
+    def _pulse_software(self, steps: int) -> None:
+        """
+        Emit steps STEP pulses from this thread on a fixed period grid
+        (2 * STEP_DELAY). Phases are timed against absolute deadlines, so
+        per-pulse Python overhead and sleep overshoot do not accumulate.
+
+        The grid carries over to the next batch: the last low phase is left
+        pending and the next call waits out its remainder, so the work between
+        batches (trigger check, status update) runs inside it instead of
+        stretching the period. A pulse that starts more than one period late
+        (preempted thread) is not followed by a catch-up burst the motor could
+        not track: the missed slots are dropped, the grid re-anchors and the
+        overrun is counted.
+        """
+        step_high, step_low = self._step_high, self._step_low
+        period = 2 * STEP_DELAY
+        deadline = self._next_pulse_t
+        if deadline is None:
+            deadline = time.perf_counter()
+        overruns = 0
         for _ in range(steps):
-            GPIO.output(STEP_PIN, GPIO.HIGH)
-            time.sleep(0.002) 
-            GPIO.output(STEP_PIN, GPIO.LOW)
-            time.sleep(0.002)
+            now = wait_until(deadline)
+            if now - deadline > period:
+                overruns += 1
+                deadline = now
+            step_high()
+            deadline += STEP_DELAY
+            wait_until(deadline)
+            step_low()
+            deadline += STEP_DELAY
+        self._next_pulse_t = deadline
+
+        if overruns:
+            self.pulse_overruns += overruns
+            print(f"[{self.name}] [WARN] Step timing overrun: {overruns} pulse slot(s) dropped "
+                  f"({self.pulse_overruns} total).")
+
+    def _pulse_wave(self, steps: int) -> None:
+        """
+        Emit steps STEP pulses as a pigpio waveform: the DMA engine clocks the
+        GPSET0/GPCLR0 writes, so edge timing does not depend on this thread.
+        Waves are built once per batch length and reused.
+        """
+        pi = self._pi
+        wave_id = self._wave_ids.get(steps)
+        if wave_id is None:
+            mask = 1 << STEP_PIN
+            delay_us = int(STEP_DELAY * 1e6)
+            pi.wave_add_generic([pigpio.pulse(mask, 0, delay_us), pigpio.pulse(0, mask, delay_us)] * steps)
+            wave_id = pi.wave_create()
+            if wave_id < 0:
+                raise RuntimeError(f"pigpio wave_create failed ({wave_id})")
+            self._wave_ids[steps] = wave_id
+
+        pi.wave_send_once(wave_id)
+        # Sleep through most of the wave, then poll for its end
+        time.sleep(max(0.0, steps * 2 * STEP_DELAY - 0.002))
+        while pi.wave_tx_busy():
+            time.sleep(0.0005)
 
     def _calculate_angle(self) -> float:
-        """Helper to get current angle based on step count."""
-        progress = self.current_step_index / STEPS_TO_SWEEP
-        return progress * SWEEP_ANGLE_TOTAL
+        """Helper to get current angle based on step count (table lookup)."""
+        return ANGLE_LUT[min(max(self.current_step_index, 0), STEPS_TO_SWEEP)]
 
-    def _send_lora_alert(self, angle: float):
-        """Sends the alert via LoRa with robust buffer handling."""
-        if self.ser and self.ser.is_open:
-            msg = f"LOUP_ANGLE:{angle:.1f}\n"
+    def _ensure_serial(self) -> bool:
+        """
+        Open the LoRa port if it is not open (LoRa writer thread only). A failed
+        open is retried on a later alert, at most once per SERIAL_RETRY_S, so an
+        unplugged radio no longer disables alerts for the rest of the run.
+        """
+        if self.ser is not None and self.ser.is_open:
+            return True
+        now = time.monotonic()
+        if now < self._serial_retry_at:
+            return False
+        try:
+            self.ser = serial.Serial(self.serial_port, self.serial_baud, timeout=1, write_timeout=1)
+            print(f"[{self.name}] [INIT] Serial connected: {self.serial_port}")
+            return True
+        except (OSError, serial.SerialException) as e:
+            self.ser = None
+            self._serial_retry_at = now + SERIAL_RETRY_S
+            print(f"[{self.name}] [WARN] Serial open failed: {e} (retry in {SERIAL_RETRY_S:.0f}s)")
+            return False
+
+    def _close_serial(self) -> None:
+        ser, self.ser = self.ser, None
+        if ser is not None:
             try:
-                self.ser.reset_input_buffer() 
-                self.ser.write(msg.encode('utf-8'))
-                self.ser.flush() 
-                print(f"[{self.name}] >>> [LORA SENT] {msg.strip()} <<<")
-            except Exception as e:
-                print(f"[{self.name}] [LORA FAIL] {e}")
+                ser.close()
+            except (OSError, serial.SerialException):
+                pass
+
+    def _send_lora_alert(self, angle: float):
+        """Queues the alert for the LoRa writer thread and returns immediately."""
+        msg = f"LOUP_ANGLE:{angle:.1f}\n"
+        self._lora_pool.submit(self._write_lora, msg)
+
+    def _write_lora(self, msg: str):
+        """
+        Write one alert line (runs on the LoRa writer thread). At 9600 baud a
+        line takes ~20 ms on the wire, which the motor thread no longer waits
+        for. The port is write-only here, so there is no input buffer to reset
+        and no flush: the driver sends the bytes on its own. A failed write
+        closes the port; the next alert reopens it.
+        """
+        if not self._ensure_serial():
+            print(f"[{self.name}] [LORA FAIL] Port {self.serial_port} unavailable, alert dropped.")
+            return
+        try:
+            self.ser.write(msg.encode('utf-8'))
+            print(f"[{self.name}] >>> [LORA SENT] {msg.strip()} <<<")
+        except (OSError, serial.SerialException) as e:
+            print(f"[{self.name}] [LORA FAIL] {e}")
+            self._close_serial()
 
     def _update_bus_status(self):
         """
-        Updates DataBus with current status once per batch.
+        Updates DataBus with current status once per batch, and on pause/resume.
         """
         state = {
             "angle": round(self._calculate_angle(), 1),
-            "direction": "RIGHT" if self.scan_direction == 1 else "LEFT",
+            "direction": DIRECTION_NAMES[(self.scan_direction + 1) // 2],
             "is_moving": not self.deter_active,
             "timestamp": time.time()
         }
-        self.data_bus.set_state("motor_location", state)
+        self.data_bus.set_motor_location(state)
 
     def step(self):
         """
@@ -145,6 +410,7 @@ class MotorWithLora(BaseModule):
             if time.time() - self.deter_start_time >= self.DETER_DURATION:
                 print(f"[{self.name}] Resume scanning...")
                 self.deter_active = False
+                self._update_bus_status()
             else:
                 # Still paused
                 time.sleep(0.05)
@@ -152,7 +418,7 @@ class MotorWithLora(BaseModule):
 
         # --- 2. Check for Trigger (Rising Edge) ---
         if not self.deter_active:
-            current_deter_flag = self.data_bus.get_state("deter_flag", default=False)
+            current_deter_flag = self.data_bus.get_deter_flag()
             
             # Check for rising edge (False -> True)
             if current_deter_flag and not self.last_deter_flag:
@@ -168,6 +434,8 @@ class MotorWithLora(BaseModule):
                 # B. Start Pause Timer
                 self.deter_active = True
                 self.deter_start_time = time.time()
+                self._next_pulse_t = None
+                self._update_bus_status()
                 
                 self.last_deter_flag = current_deter_flag
                 return 
@@ -179,33 +447,36 @@ class MotorWithLora(BaseModule):
         target_dir_pin = GPIO.HIGH if self.scan_direction == 1 else GPIO.LOW
         GPIO.output(DIR_PIN, target_dir_pin)
         
-        # Inner loop: Execute BATCH_SIZE steps in one go for smoothness
-        for _ in range(self.BATCH_SIZE):
-            
-            # 1. Generate Pulse
-            GPIO.output(STEP_PIN, GPIO.HIGH)
-            time.sleep(STEP_DELAY)
-            GPIO.output(STEP_PIN, GPIO.LOW)
-            time.sleep(STEP_DELAY)
-            
-            # 2. Update Position Index
-            if self.scan_direction == 1:
-                self.current_step_index += 1
-                # Check Right Boundary
-                if self.current_step_index >= STEPS_TO_SWEEP:
-                    self.scan_direction = -1
-                    time.sleep(DIR_DELAY)
-                    break 
-            else:
-                self.current_step_index -= 1
-                # Check Left Boundary
-                if self.current_step_index <= 0:
-                    self.scan_direction = 1
-                    time.sleep(DIR_DELAY)
-                    break 
-
-        # Update DataBus status once per batch
+        # Execute up to BATCH_SIZE steps in one go for smoothness, stopping
+        # at the sweep boundary
+        if self.scan_direction == 1:
+            steps = min(self.BATCH_SIZE, STEPS_TO_SWEEP - self.current_step_index)
+        else:
+            steps = min(self.BATCH_SIZE, self.current_step_index)
+        steps = max(steps, 1)
+
+        # 1. Generate Pulses (DMA waveform or timed software loop)
+        self._pulse_batch(steps)
+
+        # 2. Update Position Index
+        self.current_step_index += self.scan_direction * steps
+        reversed_dir = False
+        if self.scan_direction == 1 and self.current_step_index >= STEPS_TO_SWEEP:
+            # Right Boundary
+            self.scan_direction = -1
+            reversed_dir = True
+        elif self.scan_direction == -1 and self.current_step_index <= 0:
+            # Left Boundary
+            self.scan_direction = 1
+            reversed_dir = True
+
+        # Update DataBus status once per batch (before any boundary pause), so
+        # the logger reads a fresh angle on the deter_flag edge
         self._update_bus_status()
+
+        if reversed_dir:
+            time.sleep(DIR_DELAY)
+            self._next_pulse_t = None
         
         if self.should_stop():
             return
\ No newline at end of file
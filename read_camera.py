@@ -8,7 +8,7 @@ Uses configuration from DataBus.get_state("config").
 from __future__ import annotations
 
 import time
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 
 import cv2
 import numpy as np
@@ -67,12 +67,16 @@ class ReadCamera(BaseModule):
         self.req_width: Optional[int] = get_cfg("req_width")
         self.req_height: Optional[int] = get_cfg("req_height")
         self.period_s: float = float(get_cfg("period_s", 0.0))
-        self.fourcc_str: Optional[str] = get_cfg("fourcc")
+        # MJPG by default: ~10x less USB bandwidth than raw YUYV (None keeps the driver default)
+        self.fourcc_str: Optional[str] = get_cfg("fourcc", "MJPG")
+        self.fps: Optional[float] = get_cfg("fps", 30)
         self.buffer_size: int = int(get_cfg("buffer_size", 1))
 
         # --- Internal Runtime Attributes ---
         self.cap: Optional[cv2.VideoCapture] = None
         self._last_frame_ts: float = 0.0
+        # Shape of the last captured frame, used to request a pooled buffer
+        self._frame_shape: Optional[Tuple[int, ...]] = None
 
     def setup(self) -> None:
         """
@@ -98,22 +102,25 @@ class ReadCamera(BaseModule):
         if self.req_height is not None:
             self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.req_height)
 
+        if self.fps is not None:
+            self.cap.set(cv2.CAP_PROP_FPS, float(self.fps))
+
         # 3. Configuration Latence (Buffer Size)
         # Très important pour le temps réel sur RPi
         self.cap.set(cv2.CAP_PROP_BUFFERSIZE, self.buffer_size)
 
-        # Warm up
+        # Warm up: grab only, the frames are discarded so there is nothing to decode
         for _ in range(3):
-            ok, _ = self.cap.read()
-            if not ok:
+            if not self.cap.grab():
                 break
 
         self._last_frame_ts = time.time()
         print(f"[{self.name}] Camera opened successfully.")
 
-    def step(self) -> None:
+    def capture(self) -> ImageItem:
         """
-        Grabs one frame and pushes it to DataBus.image_queue.
+        Grabs one frame (honouring period_s) and wraps it in an ImageItem.
+        Shared by step() and the fused CameraYoloStage.
         """
         
         # Gestion de la fréquence de capture
@@ -127,14 +134,26 @@ class ReadCamera(BaseModule):
         if self.cap is None or not self.cap.isOpened():
             raise RuntimeError("USB camera is not opened")
 
-        # Capture
-        ok, frame = self.cap.read()
+        # Capture: grab() + retrieve() so the frame is decoded into a recycled
+        # DataBus buffer (when a consumer released one) instead of a fresh allocation.
+        if not self.cap.grab():
+            raise RuntimeError("Failed to read frame from USB camera")
+
+        buf = None
+        if self._frame_shape is not None:
+            buf = self.data_bus.acquire_frame_buffer(self._frame_shape)
+        ok, frame = self.cap.retrieve(buf)
+        if buf is not None and frame is not buf:
+            # The backend did not decode in place (e.g. the mode changed and it
+            # allocated a new array): the pooled buffer is still unused.
+            self.data_bus.release_frame_buffer(buf)
         
         if not ok or frame is None:
             raise RuntimeError("Failed to read frame from USB camera")
 
         if frame.dtype != np.uint8:
             frame = frame.astype(np.uint8, copy=False)
+        self._frame_shape = frame.shape
         
         image_item = ImageItem(
             frame=frame,
@@ -147,6 +166,15 @@ class ReadCamera(BaseModule):
             },
         )
 
+        self._last_frame_ts = now
+        return image_item
+
+    def step(self) -> None:
+        """
+        Grabs one frame and pushes it to DataBus.image_queue.
+        """
+        image_item = self.capture()
+
         # Push to queue (non-blocking)
         self.data_bus.queue_put(
             self.data_bus.image_queue,
@@ -154,8 +182,6 @@ class ReadCamera(BaseModule):
             drop_oldest_if_full=True,
         )
 
-        self._last_frame_ts = now
-
     def teardown(self) -> None:
         if self.cap is not None:
             print(f"[{self.name}] Releasing camera device.")
@@ -4,18 +4,27 @@ yolo_detector.py
 Detects objects using the Ultralytics YOLO model (v8+).
 Consumes: data_bus.image_queue (ImageItem: raw frame - expected to be a numpy array/cv2 frame)
 Produces: data_bus.detect_queue (DetectionItem)
-          [MODIFIED] DataBus Registry Snapshot (ProcessedImageItem -> "latest_processed_image_item")
+          [MODIFIED] DataBus Registry Snapshot ((annotated frame, DetectionItem) -> "latest_annotated_frame")
+          DataBus shared JPEG buffer (encoded annotated frame, for the HTTP server)
 """
 
 import time
 import cv2
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Any, List, Tuple, Optional, Dict
 from ultralytics import YOLO
 import numpy as np
+import torch  # installed with ultralytics; wraps the preprocessed input without a copy
+
+# Optional: libjpeg-turbo encoder, called directly (falls back to cv2.imencode)
+try:
+    import simplejpeg
+except ImportError:
+    simplejpeg = None  # type: ignore
 
 # Assume BaseModule and DataBus are available in the project structure
 from module_base import BaseModule
-from data_bus import DataBus, ImageItem, ErrorEntry, DetectionItem, ProcessedImageItem
+from data_bus import DataBus, ImageItem, DetectionItem
 
 # --- DEFAULT CONFIGURATION (Fallbacks only, actual values loaded from DataBus) ---
 DEFAULT_MODEL_PATH = "/home/arthurseray/Desktop/DRID/DRID_Modules/thermal_person_ncnn_model"
@@ -23,6 +32,13 @@ DEFAULT_INPUT_IMAGE_SIZE = 640
 DEFAULT_CONF_THRESHOLD = 0.25
 DEFAULT_IOU_THRESHOLD = 0.45
 DEFAULT_QUEUE_TIMEOUT = 0.1
+DEFAULT_BATCH_SIZE = 1
+DEFAULT_BATCH_FLUSH_TIMEOUT = 0.05
+DEFAULT_JPEG_QUALITY = 90
+# Ultralytics' letterbox padding value
+LETTERBOX_FILL = 114
+# Box label confidence texts "0.00".."1.00", indexed by round(conf * 100)
+CONF_TEXTS = tuple(f"{i / 100:.2f}" for i in range(101))
 DEFAULT_MAX_FAIL = 5 # Default for BaseModule failure handling
 
 
@@ -72,11 +88,35 @@ class YoloDetector(BaseModule):
         self.input_img_size: int = int(get_cfg("input_img_size", DEFAULT_INPUT_IMAGE_SIZE))
         self.conf_threshold: float = float(get_cfg("conf_threshold", DEFAULT_CONF_THRESHOLD))
         self.iou_threshold: float = float(get_cfg("iou_threshold", DEFAULT_IOU_THRESHOLD))
+        # Legacy name: True feeds the model the camera's BGR order as-is (BGR-trained
+        # model, or channel swap folded into its first conv at export); False feeds RGB
         self.bgr_to_rgb: bool = bool(get_cfg("bgr_to_rgb_conversion", False))
         self.queue_timeout_s: float = float(get_cfg("queue_timeout_s", DEFAULT_QUEUE_TIMEOUT))
+        self.batch_size: int = max(1, int(get_cfg("batch_size", DEFAULT_BATCH_SIZE)))
+        self.batch_flush_timeout_s: float = float(get_cfg("batch_flush_timeout_s", DEFAULT_BATCH_FLUSH_TIMEOUT))
+        self.publish_jpeg: bool = bool(get_cfg("publish_jpeg", True))
+        self.jpeg_quality: int = int(get_cfg("jpeg_quality", DEFAULT_JPEG_QUALITY))
+        self._jpeg_params: List[int] = [int(cv2.IMWRITE_JPEG_QUALITY), self.jpeg_quality]
+        self.jpeg_max_width: Optional[int] = get_cfg("jpeg_max_width", 640) # None = full resolution
+        self._resize_buf: Optional[np.ndarray] = None
+
+        # Preprocessing buffers, reused across frames (see _prepare_input):
+        # letterboxed uint8 HWC canvas and float32 BCHW model input; the canvas
+        # padding is valid for the (pad_x, pad_y, new_w, new_h) in _lb_geometry
+        self._lb_buf: Optional[np.ndarray] = None
+        self._lb_geometry: Optional[Tuple[int, int, int, int]] = None
+        self._input_buf: Optional[np.ndarray] = None
+        # (frame height, width) -> (scale, pad_x, pad_y, new_w, new_h)
+        self._lb_params: Dict[Tuple[int, int], Tuple[float, int, int, int, int]] = {}
+
+        # Single worker that draws/publishes/encodes batch N while batch N+1 is inferred
+        self._publish_pool: Optional[ThreadPoolExecutor] = None
+        self._publish_future: Optional[Future] = None
         
         self.model: Optional[YOLO] = None 
         self.class_names: Dict[int, str] = {}
+        # "<class name> " per class id, formatted once (see _process_yolo_results)
+        self._label_prefixes: Dict[int, str] = {}
 
 
     def setup(self) -> None:
@@ -90,52 +130,91 @@ class YoloDetector(BaseModule):
         
         # Get class names for labeling results
         self.class_names = self.model.names
+        self._label_prefixes = {cls_id: f"{name} " for cls_id, name in self.class_names.items()}
         
+        self._publish_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"{self.name}-publish")
         print(f"[{self.name}] Setup: Model loaded. Input size: {self.input_img_size}")
+        if self.model_weights_path.endswith(".pt"):
+            # Exported models (NCNN, OpenVINO/TFLite int8, Edge TPU) load through the
+            # same YOLO() call; raw PyTorch FP32 weights are the slowest CPU path.
+            print(f"[{self.name}] [WARN] Running PyTorch FP32 weights. For the Pi, export once "
+                  f"(e.g. model.export(format='tflite', int8=True, imgsz={self.input_img_size})) "
+                  f"and point yolo_model_weights_path at the exported model.")
 
     def teardown(self) -> None:
         """
-        Clean up resources if necessary.
+        Publish the last in-flight batch and stop the publish worker.
         """
         # (YOLO model object usually cleans itself up, but this hook is available)
-        pass
+        if self._publish_pool is not None:
+            try:
+                self._wait_for_publish()
+            finally:
+                self._publish_pool.shutdown(wait=True)
+                self._publish_pool = None
 
-    def _process_yolo_results(self, frame: np.ndarray, results: Any) -> Tuple[np.ndarray, List[Any], List[float], List[str]]:
+    def _wait_for_publish(self) -> None:
+        """Wait for the previous batch to be published; re-raises its error in the module thread."""
+        future, self._publish_future = self._publish_future, None
+        if future is not None:
+            future.result()
+
+    def _process_yolo_results(self, frame: np.ndarray, result: Any) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
         """
-        Helper to parse YOLO results and draw annotations.
+        Helper to parse one frame's YOLO result and draw annotations.
 
         Returns:
-            processed_frame, boxes_list, scores_list, labels_list
+            processed_frame, boxes (float32 [N, 4]), scores (float32 [N]),
+            labels (int32 [N] class ids) - the DetectionItem array layout.
+            processed_frame is frame itself: boxes are drawn in place, since the
+            detector is the frame's only user once dequeued and a published frame
+            is never released back to the FramePool. Only a read-only frame is
+            copied before drawing.
         """
         
-        boxes_list: List[Any] = []
-        scores_list: List[float] = []
-        labels_list: List[str] = []
-        
-        annotated_frame = frame.copy()
-        
-        # We only expect one results object from model() call with batch size 1
-        result = results[0]
-
-        for box in result.boxes:
-            # Apply confidence and IOU filtering are typically done in the model() call, 
-            # but we ensure we only draw/collect boxes that pass the required conf threshold
-            conf = float(box.conf[0])
-            if conf < self.conf_threshold: # Check confidence (redundant if passed to model() call)
-                continue
-                
-            x1, y1, x2, y2 = box.xyxy[0].cpu().numpy().astype(int)
-            cls_id = int(box.cls[0])
-            label = self.class_names.get(cls_id, f"Unknown_{cls_id}")
+        det = result.boxes
+        if len(det):
+            # One device->host transfer for the whole frame: Boxes.data is the
+            # [N, 6] (x1, y1, x2, y2, conf, cls) tensor (7 columns when tracking,
+            # with the track id before conf), so fields are column slices of it
+            data = det.data.cpu().numpy()
+            confs = data[:, -2].astype(np.float32, copy=False)
+            # Confidence filtering is normally done by the model() call already;
+            # keep the check for backends that ignore conf=
+            keep = confs >= self.conf_threshold
+            data = data[keep]
+            # Boxes are in letterboxed input coordinates: map back to the frame
+            height, width = frame.shape[:2]
+            scale, pad_x, pad_y, _, _ = self._letterbox_params(height, width)
+            xyxy = (data[:, :4] - (pad_x, pad_y, pad_x, pad_y)) / scale
+            np.clip(xyxy, 0, (width, height, width, height), out=xyxy) # as Ultralytics scale_boxes
+            # Pixel coordinates of frames up to 32767 px wide fit int16
+            coords = xyxy.astype(np.int16)
+            scores = confs[keep]
+            labels = data[:, -1].astype(np.int32)
+        else:
+            coords = np.empty((0, 4), dtype=np.int16)
+            scores = np.empty(0, dtype=np.float32)
+            labels = np.empty(0, dtype=np.int32)
+
+        if not len(coords):
+            return frame, coords.astype(np.float32), scores, labels
 
-            # Collect data for DataBus queues
-            boxes_list.append([x1, y1, x2, y2])
-            scores_list.append(conf)
-            labels_list.append(label)
+        # Draw straight onto the camera frame: only the box/text pixels change,
+        # so a full-frame copy per annotated frame is not needed
+        annotated_frame = frame if frame.flags.writeable else frame.copy()
+        # Label texts from preformatted parts: class prefix + table lookup of the
+        # score rounded to 2 decimals (one vectorized rounding for all boxes)
+        prefixes = self._label_prefixes
+        conf_idx = np.rint(np.clip(scores, 0.0, 1.0) * 100).astype(np.intp)
+        for (x1, y1, x2, y2), conf_i, cls_id in zip(coords.tolist(), conf_idx.tolist(), labels.tolist()):
+            prefix = prefixes.get(cls_id)
+            if prefix is None:
+                prefix = prefixes[cls_id] = f"Unknown_{cls_id} "
 
-            # Draw box on the frame for processed_image_queue
+            # Draw box on the annotated frame (published as latest_annotated_frame)
             cv2.rectangle(annotated_frame, (x1, y1), (x2, y2), (0, 255, 0), 2)
-            text = f"{label} {conf:.2f}"
+            text = prefix + CONF_TEXTS[conf_i]
             cv2.putText(
                 annotated_frame,
                 text,
@@ -147,50 +226,142 @@ class YoloDetector(BaseModule):
                 cv2.LINE_AA,
             )
 
-        return annotated_frame, boxes_list, scores_list, labels_list
+        return annotated_frame, coords.astype(np.float32), scores, labels
 
-    def step(self):
+    def _letterbox_params(self, height: int, width: int) -> Tuple[float, int, int, int, int]:
+        """Scale and padding that fit a height x width frame into the square model input."""
+        params = self._lb_params.get((height, width))
+        if params is None:
+            size = self.input_img_size
+            scale = min(size / height, size / width)
+            new_w, new_h = round(width * scale), round(height * scale)
+            params = (scale, (size - new_w) // 2, (size - new_h) // 2, new_w, new_h)
+            self._lb_params[(height, width)] = params
+        return params
+
+    def _prepare_input(self, frames: List[np.ndarray]) -> "torch.Tensor":
+        """
+        Letterbox and normalize frames into the reused float32 BCHW input buffer
+        and return it as a tensor (shared memory, no copy). Ultralytics skips its
+        own per-call letterbox/stack/transpose/normalize for tensor input; boxes
+        then come back in input coordinates (undone in _process_yolo_results).
+
+        Channel order matches what Ultralytics fed the model for numpy input
+        (it swaps BGR->RGB itself): RGB by default, BGR with bgr_to_rgb. The swap
+        is a strided view folded into the normalizing divide, never a cvtColor copy.
         """
-        1. Read the next frame from the image_queue.
-        2. Perform YOLO prediction.
-        3. Draw results on the frame.
-        4. Push detection data to the queue and processed frame to the registry.
+        size = self.input_img_size
+        n = len(frames)
+        if self._input_buf is None or self._input_buf.shape[0] < n:
+            self._input_buf = np.empty((max(n, self.batch_size), 3, size, size), dtype=np.float32)
+        if self._lb_buf is None:
+            self._lb_buf = np.full((size, size, 3), LETTERBOX_FILL, dtype=np.uint8)
+
+        for i, frame in enumerate(frames):
+            height, width = frame.shape[:2]
+            _, pad_x, pad_y, new_w, new_h = self._letterbox_params(height, width)
+            if self._lb_geometry != (pad_x, pad_y, new_w, new_h):
+                self._lb_geometry = (pad_x, pad_y, new_w, new_h)
+                self._lb_buf.fill(LETTERBOX_FILL) # new geometry: reset the padding
+            # Resize straight into the canvas ROI (a strided view OpenCV writes
+            # in place); the copy only runs if the binding had to reallocate
+            roi = self._lb_buf[pad_y:pad_y + new_h, pad_x:pad_x + new_w]
+            resized = cv2.resize(frame, (new_w, new_h), dst=roi, interpolation=cv2.INTER_LINEAR)
+            if resized is not roi:
+                roi[...] = resized
+
+            canvas = self._lb_buf if self.bgr_to_rgb else self._lb_buf[..., ::-1]
+            np.divide(canvas, 255.0, out=self._input_buf[i].transpose(1, 2, 0))
+
+        return torch.from_numpy(self._input_buf[:n])
+
+    def _encode_jpeg(self, frame: np.ndarray) -> Optional[Any]:
         """
-        
-        image_item: ImageItem = self.data_bus.queue_get(
+        Encode a BGR frame to JPEG (bytes-like), or None on failure.
+        Uses simplejpeg (direct libjpeg-turbo call, no Mat wrapping) when installed.
+        Frames wider than jpeg_max_width are downscaled first (INTER_AREA, into
+        a reused buffer): encode cost scales with the pixel count.
+        """
+        height, width = frame.shape[:2]
+        if self.jpeg_max_width and width > self.jpeg_max_width:
+            size = (int(self.jpeg_max_width), max(1, round(height * self.jpeg_max_width / width)))
+            shape = (size[1], size[0]) + frame.shape[2:]
+            if self._resize_buf is None or self._resize_buf.shape != shape or self._resize_buf.dtype != frame.dtype:
+                self._resize_buf = np.empty(shape, dtype=frame.dtype)
+            frame = cv2.resize(frame, size, dst=self._resize_buf, interpolation=cv2.INTER_AREA)
+        if simplejpeg is not None and frame.ndim == 3 and frame.shape[2] == 3:
+            return simplejpeg.encode_jpeg(
+                np.ascontiguousarray(frame), quality=self.jpeg_quality, colorspace='BGR', fastdct=True
+            )
+        ok, jpeg_buffer = cv2.imencode('.jpg', frame, self._jpeg_params)
+        return jpeg_buffer if ok else None
+
+    def _next_batch(self) -> List[ImageItem]:
+        """
+        Collect up to batch_size frames from the image_queue.
+
+        Blocks up to queue_timeout_s for the first frame, then waits at most
+        batch_flush_timeout_s for the rest so a partial batch is never held back.
+        With batch_size=1 this is a single queue_get().
+        """
+        first: Optional[ImageItem] = self.data_bus.queue_get(
             q=self.data_bus.image_queue,
             timeout=self.queue_timeout_s,
         )
+        if first is None:
+            return []
 
-        if image_item is None:
-            return
+        batch = [first]
+        deadline = time.time() + self.batch_flush_timeout_s
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            item = self.data_bus.queue_get(q=self.data_bus.image_queue, timeout=remaining)
+            if item is None:
+                break
+            batch.append(item)
+        return batch
+
+    def step(self):
+        """
+        1. Read the next frame (or batch of frames) from the image_queue.
+        2. Run detection on it (see process_items).
+        """
+        self.process_items(self._next_batch())
 
-        # --- Process Frame ---
-        raw_frame = image_item.frame
+    def process_items(self, items: List[ImageItem]) -> None:
+        """
+        1. Perform YOLO prediction once for the whole batch.
+        2. Draw results on each frame.
+        3. Push detection data to the queue and processed frame to the registry,
+           one frame at a time.
+        Steps 2-3 run on the publish worker (see _publish_results), overlapping
+        inference of the next batch.
+        Shared by step() and the fused CameraYoloStage.
+        """
         
-        if raw_frame is None or not isinstance(raw_frame, np.ndarray):
-            self.data_bus.queue_put(
-                self.data_bus.error_log,
-                ErrorEntry(time.time(), self.name, "WARNING", "Received invalid frame data from image_queue."),
-                drop_oldest_if_full=True
-            )
+        image_items: List[ImageItem] = []
+        for image_item in items:
+            raw_frame = image_item.frame
+            if raw_frame is None or not isinstance(raw_frame, np.ndarray):
+                self.data_bus.push_error(self.name, "WARNING", "Received invalid frame data.")
+                continue
+            image_items.append(image_item)
+
+        if not image_items:
             return
 
-        frame_meta = dict(image_item.meta)
-        frame_meta['detector_module'] = self.name
-        
         # --- Input Frame Preparation for YOLO ---
-        input_frame_for_yolo = raw_frame
-        # If configured, convert BGR (OpenCV default) to RGB 
-        if self.bgr_to_rgb:
-            input_frame_for_yolo = cv2.cvtColor(raw_frame, cv2.COLOR_BGR2RGB)
+        # Letterbox + normalize into the preallocated input tensor
+        inputs_for_yolo = self._prepare_input([item.frame for item in image_items])
         
-        # 2. Perform YOLO inference
+        # 1. Perform YOLO inference (the batch tensor is run as one batch)
         t_yolo_start = time.time()
         
         # Run prediction with runtime parameters (conf/iou thresholds)
         results = self.model(
-            input_frame_for_yolo, 
+            inputs_for_yolo, 
             imgsz=self.input_img_size, 
             conf=self.conf_threshold, # Filter results below this confidence
             iou=self.iou_threshold,   # NMS threshold
@@ -198,39 +369,61 @@ class YoloDetector(BaseModule):
         )
         t_yolo_end = time.time()
         
-        frame_meta['yolo_inference_ms'] = (t_yolo_end - t_yolo_start) * 1000.0
-
-        # 3. Draw results and parse data
-        (
-            processed_frame, 
-            boxes, 
-            scores, 
-            labels
-        ) = self._process_yolo_results(raw_frame, results) # Pass raw_frame to ensure BGR draw colors
-
-        # 4. Push detection data (queue) and processed frame (registry snapshot)
-        # [MODIFIED] push_detection_with_image now handles both the detect_queue push 
-        # and the "latest_processed_image_item" state update.
-        self.data_bus.push_detection_with_image(
-            boxes=boxes,
-            scores=scores,
-            labels=labels,
-            processed_frame=processed_frame,
-            meta=frame_meta,
-            drop_oldest_if_full=True, 
+        # Amortized per-frame inference cost
+        inference_ms = (t_yolo_end - t_yolo_start) * 1000.0 / len(image_items)
+
+        # Hand drawing/publishing to the worker and return to fetch + infer the next
+        # batch. At most one batch is in flight, so results are published in order
+        # and a failing publish still counts against this module's step.
+        self._wait_for_publish()
+        self._publish_future = self._publish_pool.submit(
+            self._publish_results, image_items, results, inference_ms
         )
-        
-        # Optional: Log detection event
-        if boxes:
-            log_message = f"Detection found: {len(boxes)} object(s)."
-            error_entry = ErrorEntry(
-                timestamp=time.time(),
-                module=self.name,
-                level="INFO",
-                message=log_message
+
+    def _publish_results(self, image_items: List[ImageItem], results: Any, inference_ms: float) -> None:
+        """
+        Runs on the publish worker: draw each frame's detections, push them to the
+        DataBus and export the encoded JPEG (cv2 and the encoder release the GIL,
+        so this overlaps the next inference).
+        """
+        for image_item, result in zip(image_items, results):
+            # Fresh dict handed over to the DataBus (wrapped read-only, not copied)
+            frame_meta = {
+                **image_item.meta,
+                'detector_module': self.name,
+                'yolo_inference_ms': inference_ms,
+                'yolo_batch_size': len(image_items),
+            }
+
+            # 2. Draw results and parse data
+            (
+                processed_frame, 
+                boxes, 
+                scores, 
+                labels
+            ) = self._process_yolo_results(image_item.frame, result) # Pass raw frame to ensure BGR draw colors
+
+            # 3. Push detection data (queue) and processed frame (registry snapshot)
+            # [MODIFIED] push_detection_with_image now handles both the detect_queue push 
+            # and the "latest_annotated_frame" state update.
+            self.data_bus.push_detection_with_image(
+                boxes=boxes,
+                scores=scores,
+                labels=labels,
+                processed_frame=processed_frame,
+                meta=frame_meta,
+                drop_oldest_if_full=True, 
+                timestamp=image_item.timestamp, # capture time of the source frame
             )
-            self.data_bus.queue_put(
-                self.data_bus.error_log, 
-                error_entry, 
-                drop_oldest_if_full=True
-            )
\ No newline at end of file
+
+            # Export the encoded frame once here, so HTTP readers just copy bytes
+            # out of the shared buffer instead of re-encoding per request.
+            if self.publish_jpeg:
+                jpeg_buffer = self._encode_jpeg(processed_frame)
+                if jpeg_buffer is not None and not self.data_bus.publish_jpeg(jpeg_buffer):
+                    self.data_bus.push_error(self.name, "WARNING", f"JPEG ({len(jpeg_buffer)} bytes) exceeds the shared buffer.")
+            
+            # Optional: Log detection event (formatted later by the logger)
+            if len(boxes):
+                self.data_bus.push_detection_event(self.name, len(boxes), image_item.timestamp)
+